@@ -16,7 +16,8 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 HOOKS_DIR = os.path.join(".claude", "hooks")
 SETTINGS_FILE = os.path.join(".claude", "settings.json")
 
-HOOK_SCRIPTS = ["stop-log.py", "subagent-stop-log.py", "log-converter.py"]
+HOOK_SCRIPTS = ["stop-log.py", "subagent-stop-log.py", "hook-common.py",
+                "log-converter.py"]
 SERVE_SCRIPT = "serve-sessions.py"
 
 HOOKS_CONFIG = {
@@ -90,16 +91,19 @@ def main():
 
     os.makedirs(HOOKS_DIR, exist_ok=True)
 
+    # Patch as bytes: the only edit is the TZ placeholder, so there is no
+    # need to decode and re-encode the scripts
+    tz_bytes = tz_value.encode("utf-8")
     for script in HOOK_SCRIPTS:
         src = os.path.join(SCRIPT_DIR, "py", script)
         dst = os.path.join(HOOKS_DIR, script)
 
-        with open(src, "r") as f:
+        with open(src, "rb") as f:
             content = f.read()
 
-        content = content.replace("__TZ__", tz_value)
+        content = content.replace(b"__TZ__", tz_bytes)
 
-        with open(dst, "w") as f:
+        with open(dst, "wb") as f:
             f.write(content)
 
     info(f"Installed hook scripts to {HOOKS_DIR}/")
@@ -113,8 +117,6 @@ def main():
 
     # --- Merge settings ---
 
-    os.makedirs(".claude", exist_ok=True)
-
     try:
         with open(SETTINGS_FILE, "r") as f:
             settings = json.load(f)
@@ -125,9 +127,9 @@ def main():
     existing_hooks.update(HOOKS_CONFIG)
     settings["hooks"] = existing_hooks
 
+    payload = json.dumps(settings, indent=2) + "\n"
     with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=2)
-        f.write("\n")
+        f.write(payload)
 
     info(f"Updated {SETTINGS_FILE}")
 
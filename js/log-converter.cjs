@@ -4,6 +4,13 @@
  *
  * Usage:
  *   node log-converter.js --transcript PATH --output PATH
+ *   node log-converter.js --transcript PATH --output PATH --jsonl-sidecar PATH
+ *   node log-converter.js --batch < requests.jsonl
+ *
+ * With --jsonl-sidecar, also writes the grouped conversation items as JSONL.
+ * With --batch, reads one JSON object per line on stdin (same snake_case
+ * keys as the Python converter's convert()) and converts them all in one
+ * process.
  */
 
 const fs = require("fs");
@@ -396,37 +403,111 @@ function renderHeader(sessionId, dateStr, startTime, agentType, agentId) {
   return parts.join("\n");
 }
 
-function main() {
-  const args = parseArgs(process.argv);
-  if (!args.transcript || !args.output) {
-    process.stderr.write("Usage: node log-converter.js --transcript PATH --output PATH\n");
-    process.exit(1);
+function sidecarRecord(item) {
+  const [kind, payload, timestamp] = item;
+  if (kind === "user") return { kind, timestamp, text: payload };
+  if (kind === "tool_result") {
+    return {
+      kind,
+      timestamp,
+      tool_use_id: payload.tool_use_id || "",
+      is_error: !!payload.is_error,
+      content: cleanResultText(formatToolResultContent(payload.content || "")),
+    };
   }
+  return { kind, timestamp, blocks: payload };
+}
 
-  const records = parseJsonl(args.transcript);
+/** Write grouped items as JSONL in a single batched write. */
+function writeJsonlSidecar(filePath, items) {
+  const batch = items.map((item) => JSON.stringify(sidecarRecord(item)) + "\n");
+  fs.mkdirSync(path.dirname(path.resolve(filePath)), { recursive: true });
+  fs.writeFileSync(filePath, batch.join(""));
+}
+
+/**
+ * Convert a JSONL transcript into a markdown log written to opts.output.
+ * opts: { transcript, output, sessionId, date, startTime, agentType,
+ * agentId, jsonlSidecar }. This is what the command line runs; it is also
+ * exported so callers can convert without spawning a new node process.
+ */
+function convert(opts) {
+  const records = parseJsonl(opts.transcript);
 
   if (!records.length) {
-    if (!fs.existsSync(args.output)) {
-      const dir = path.dirname(path.resolve(args.output));
+    if (!fs.existsSync(opts.output)) {
+      const dir = path.dirname(path.resolve(opts.output));
       fs.mkdirSync(dir, { recursive: true });
-      fs.writeFileSync(args.output, "");
+      fs.writeFileSync(opts.output, "");
+    }
+    if (opts.jsonlSidecar && !fs.existsSync(opts.jsonlSidecar)) {
+      writeJsonlSidecar(opts.jsonlSidecar, []);
     }
     return;
   }
 
   const items = groupAssistantRecords(records);
   const header = renderHeader(
-    args["session-id"],
-    args.date,
-    args["start-time"],
-    args["agent-type"],
-    args["agent-id"]
+    opts.sessionId,
+    opts.date,
+    opts.startTime,
+    opts.agentType,
+    opts.agentId
   );
   const body = renderMarkdown(items);
 
-  const dir = path.dirname(path.resolve(args.output));
+  const dir = path.dirname(path.resolve(opts.output));
   fs.mkdirSync(dir, { recursive: true });
-  fs.writeFileSync(args.output, header + body);
+  fs.writeFileSync(opts.output, header + body);
+
+  if (opts.jsonlSidecar) {
+    writeJsonlSidecar(opts.jsonlSidecar, items);
+  }
+}
+
+/** Run convert() once per JSON line of input (see --batch). */
+function convertBatch(input) {
+  for (const line of input.split("\n")) {
+    if (!line.trim()) continue;
+    const req = JSON.parse(line);
+    convert({
+      transcript: req.transcript,
+      output: req.output,
+      sessionId: req.session_id,
+      date: req.date,
+      startTime: req.start_time,
+      agentType: req.agent_type,
+      agentId: req.agent_id,
+      jsonlSidecar: req.jsonl_sidecar,
+    });
+  }
 }
 
-main();
+function main() {
+  if (process.argv[2] === "--batch") {
+    convertBatch(fs.readFileSync(0, "utf-8"));
+    return;
+  }
+  const args = parseArgs(process.argv);
+  if (!args.transcript || !args.output) {
+    process.stderr.write("Usage: node log-converter.js --transcript PATH --output PATH\n");
+    process.exit(1);
+  }
+
+  convert({
+    transcript: args.transcript,
+    output: args.output,
+    sessionId: args["session-id"],
+    date: args.date,
+    startTime: args["start-time"],
+    agentType: args["agent-type"],
+    agentId: args["agent-id"],
+    jsonlSidecar: args["jsonl-sidecar"],
+  });
+}
+
+module.exports = { convert };
+
+if (require.main === module) {
+  main();
+}
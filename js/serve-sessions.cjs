@@ -13,12 +13,15 @@
  *   node serve-sessions.js --host 0.0.0.0       # expose to network
  *   node serve-sessions.js --cert C --key K     # custom cert
  *   node serve-sessions.js --dir .claude/logs   # custom log directory
+ *   node serve-sessions.js --asset-dir DIR      # custom asset cache
+ *   node serve-sessions.js --no-fetch-assets    # never download assets
  */
 
 const http = require("http");
 const https = require("https");
 const fs = require("fs");
 const path = require("path");
+const crypto = require("crypto");
 const { execSync } = require("child_process");
 
 const DEFAULT_PORT = 9443;
@@ -26,6 +29,7 @@ const DEFAULT_HOST = "127.0.0.1";
 const DEFAULT_DIR = path.join(".claude", "logs");
 const DEFAULT_CERT_DIR = path.join(".claude", "certs");
 const PID_FILE = path.join(".claude", "serve-sessions.pid");
+const DEFAULT_ASSET_DIR = path.join(".claude", "assets");
 const CERT_FILE = "localhost.pem";
 const KEY_FILE = "localhost-key.pem";
 
@@ -37,14 +41,32 @@ const LOG_NAME_RE =
 const LABEL_RE =
   /^#\s+(?:Session|Subagent:\s+\S+)\s+.+?\u2014\s+\d{4}-\d{2}-\d{2}(?:\s+\d{2}:\d{2})?\s*\u2014\s+(.+)$/;
 
+// Front-end assets for rendered pages, served from /assets/. Each is fetched
+// once from the CDN into the asset dir; until then /assets/ redirects there.
+const ASSETS = {
+  "marked.min.js": [
+    "https://cdn.jsdelivr.net/npm/marked/marked.min.js",
+    "application/javascript; charset=utf-8",
+  ],
+  "github-markdown-dark.min.css": [
+    "https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-dark.min.css",
+    "text/css; charset=utf-8",
+  ],
+  "github-markdown-light.min.css": [
+    "https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-light.min.css",
+    "text/css; charset=utf-8",
+  ],
+};
+const ASSET_FETCH_TIMEOUT_MS = 10000;
+
 const HTML_TEMPLATE = `<!DOCTYPE html>
 <html lang="en" data-theme="dark">
 <head>
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1">
 <title>TITLE</title>
-<link id="md-css" rel="stylesheet" href="https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-dark.min.css">
-<script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"><\/script>
+<link id="md-css" rel="stylesheet" href="/assets/github-markdown-dark.min.css">
+<script src="/assets/marked.min.js"><\/script>
 <style>
   html[data-theme="dark"] body {
     background: #0d1117;
@@ -105,8 +127,8 @@ const HTML_TEMPLATE = `<!DOCTYPE html>
     document.querySelector('.theme-toggle').textContent = theme === 'dark' ? '\u263c' : '\u263d';
     var css = document.getElementById('md-css');
     css.href = theme === 'dark'
-      ? 'https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-dark.min.css'
-      : 'https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-light.min.css';
+      ? '/assets/github-markdown-dark.min.css'
+      : '/assets/github-markdown-light.min.css';
   }
   function toggleTheme() {
     setTheme(document.documentElement.dataset.theme === 'dark' ? 'light' : 'dark');
@@ -351,6 +373,79 @@ function ensureCert(certDir) {
   return { certPath, keyPath };
 }
 
+/** Return fs.Stats (with bigint ns times) if p is a regular file, else null. */
+function statFile(p) {
+  try {
+    const st = fs.statSync(p, { bigint: true });
+    return st.isFile() ? st : null;
+  } catch {
+    return null;
+  }
+}
+
+/** Strong ETag for a file's current contents, from its mtime and size. */
+function fileEtag(st, variant = "") {
+  return `"${st.mtimeNs.toString(16)}-${st.size.toString(16)}${variant}"`;
+}
+
+/**
+ * True if the request's If-None-Match / If-Modified-Since show that the
+ * client's cached copy is current. If-None-Match takes precedence.
+ */
+function isFresh(req, etag, mtime) {
+  const ifNoneMatch = req.headers["if-none-match"];
+  if (ifNoneMatch !== undefined) {
+    const tags = ifNoneMatch.split(",").map((t) => t.trim());
+    return tags.includes("*") || tags.includes(etag);
+  }
+  const ifModifiedSince = req.headers["if-modified-since"];
+  if (ifModifiedSince && mtime) {
+    const since = Date.parse(ifModifiedSince);
+    return !Number.isNaN(since) && Math.floor(mtime.getTime() / 1000) * 1000 <= since;
+  }
+  return false;
+}
+
+/** ETag/Last-Modified headers for a cacheable response. */
+function validatorHeaders(etag, mtime) {
+  // Logs keep changing while a session is live, so always revalidate
+  const headers = { ETag: etag, "Cache-Control": "no-cache" };
+  if (mtime) headers["Last-Modified"] = mtime.toUTCString();
+  return headers;
+}
+
+/**
+ * Download any missing front-end assets into assetDir, in the background.
+ * Failures are ignored; the /assets/ route keeps redirecting to the CDN for
+ * anything that isn't on disk yet.
+ */
+function fetchAssets(assetDir) {
+  for (const [name, [url]] of Object.entries(ASSETS)) {
+    const dest = path.join(assetDir, name);
+    if (fs.existsSync(dest)) continue;
+    const req = https.get(url, { timeout: ASSET_FETCH_TIMEOUT_MS }, (res) => {
+      if (res.statusCode !== 200) {
+        res.resume();
+        return;
+      }
+      const chunks = [];
+      res.on("data", (chunk) => chunks.push(chunk));
+      res.on("end", () => {
+        try {
+          fs.mkdirSync(assetDir, { recursive: true });
+          // Write to a temp name first so a partial file is never served
+          const tmp = `${dest}.${process.pid}.tmp`;
+          fs.writeFileSync(tmp, Buffer.concat(chunks));
+          fs.renameSync(tmp, dest);
+        } catch {}
+      });
+      res.on("error", () => {});
+    });
+    req.on("timeout", () => req.destroy());
+    req.on("error", () => {});
+  }
+}
+
 function parseArgs(argv) {
   const args = {
     port: DEFAULT_PORT,
@@ -359,6 +454,8 @@ function parseArgs(argv) {
     useHttp: false,
     cert: null,
     key: null,
+    assetDir: DEFAULT_ASSET_DIR,
+    fetchAssets: true,
   };
   for (let i = 2; i < argv.length; i++) {
     if (argv[i] === "--port" && argv[i + 1]) {
@@ -373,6 +470,10 @@ function parseArgs(argv) {
       args.cert = argv[++i];
     } else if (argv[i] === "--key" && argv[i + 1]) {
       args.key = argv[++i];
+    } else if (argv[i] === "--asset-dir" && argv[i + 1]) {
+      args.assetDir = argv[++i];
+    } else if (argv[i] === "--no-fetch-assets") {
+      args.fetchAssets = false;
     }
   }
   return args;
@@ -383,31 +484,80 @@ function main() {
 
   fs.mkdirSync(args.dir, { recursive: true });
 
+  // Cache the front-end assets locally without delaying startup
+  if (args.fetchAssets) fetchAssets(args.assetDir);
+
   function handler(req, res) {
     const urlPath = decodeURIComponent(req.url || "/").replace(/^\/+/, "");
 
-    function respond(code, body, contentType) {
+    function respond(code, body, contentType, extraHeaders = {}) {
       const buf = Buffer.from(body, "utf-8");
       res.writeHead(code, {
         "Content-Type": contentType,
         "Content-Length": buf.length,
         "Access-Control-Allow-Origin": "*",
+        ...extraHeaders,
       });
       res.end(buf);
     }
 
+    // Send a 304 and return true if the client's cached copy is current
+    function notModified(etag, mtime) {
+      if (!isFresh(req, etag, mtime)) return false;
+      res.writeHead(304, validatorHeaders(etag, mtime));
+      res.end();
+      return true;
+    }
+
     // Index
     if (!urlPath) {
-      respond(200, buildIndex(args.dir), "text/html");
+      const body = buildIndex(args.dir);
+      const etag = `"${crypto.createHash("md5").update(body).digest("hex").slice(0, 16)}"`;
+      if (!notModified(etag, null)) {
+        respond(200, body, "text/html", validatorHeaders(etag, null));
+      }
+      return;
+    }
+
+    // Front-end assets: /assets/name
+    if (urlPath.startsWith("assets/")) {
+      const name = urlPath.slice("assets/".length);
+      if (!Object.prototype.hasOwnProperty.call(ASSETS, name)) {
+        respond(404, "Not found", "text/plain");
+        return;
+      }
+      const [url, contentType] = ASSETS[name];
+      const localPath = path.join(args.assetDir, name);
+      let data;
+      try {
+        data = fs.readFileSync(localPath);
+      } catch {
+        res.writeHead(302, { Location: url, "Content-Length": 0 });
+        res.end();
+        return;
+      }
+      res.writeHead(200, {
+        "Content-Type": contentType,
+        "Content-Length": data.length,
+        "Access-Control-Allow-Origin": "*",
+      });
+      res.end(data);
       return;
     }
 
     // Raw markdown: /filename.md
     if (urlPath.endsWith(".md")) {
       const filePath = path.join(args.dir, path.basename(urlPath));
+      const st = statFile(filePath);
+      if (!st) {
+        respond(404, "Not found", "text/plain");
+        return;
+      }
+      const etag = fileEtag(st);
+      if (notModified(etag, st.mtime)) return;
       try {
         const content = fs.readFileSync(filePath, "utf-8");
-        respond(200, content, "text/plain; charset=utf-8");
+        respond(200, content, "text/plain; charset=utf-8", validatorHeaders(etag, st.mtime));
       } catch {
         respond(404, "Not found", "text/plain");
       }
@@ -416,6 +566,13 @@ function main() {
 
     // Rendered HTML: /filename (no .md)
     const mdFile = path.join(args.dir, path.basename(urlPath) + ".md");
+    const st = statFile(mdFile);
+    if (!st) {
+      respond(404, "Not found", "text/plain");
+      return;
+    }
+    const etag = fileEtag(st, "-html");
+    if (notModified(etag, st.mtime)) return;
     try {
       const content = fs.readFileSync(mdFile, "utf-8");
       const title = escapeHtml(path.basename(urlPath));
@@ -423,7 +580,7 @@ function main() {
         "CONTENT",
         escapeHtml(content)
       );
-      respond(200, body, "text/html");
+      respond(200, body, "text/html", validatorHeaders(etag, st.mtime));
     } catch {
       respond(404, "Not found", "text/plain");
     }
@@ -0,0 +1,130 @@
+"""Helpers shared by the stop hooks (stop-log.py and subagent-stop-log.py).
+
+Installed beside them in .claude/hooks/ and loaded by file path.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+# Zone names that are plain UTC, where no tzdata lookup is needed
+UTC_ZONES = frozenset(("UTC", "Etc/UTC", "UCT", "Etc/UCT", "GMT", "Etc/GMT",
+                       "Universal", "Etc/Universal", "Zulu", "Etc/Zulu"))
+
+# Flush wait: give up after FLUSH_TIMEOUT; FLUSH_QUIET since the last write
+# means done
+FLUSH_TIMEOUT = 2.0
+FLUSH_QUIET = 0.2
+
+# Bytes per os.read while looking for the first timestamped record
+TIMESTAMP_READ_SIZE = 8192
+
+
+def wait_for_flush(path):
+    """Wait for the transcript to finish flushing.
+
+    Done once the file has gone FLUSH_QUIET without a write. The quiet
+    period is timed from the file's mtime, so a transcript that is already
+    quiet returns at once and an active one is slept on only until its
+    quiet period would end. Gives up after FLUSH_TIMEOUT.
+    """
+    deadline = time.monotonic() + FLUSH_TIMEOUT
+    while True:
+        try:
+            idle = time.time() - os.stat(path).st_mtime
+        except OSError:
+            return
+        remaining = deadline - time.monotonic()
+        if idle >= FLUSH_QUIET or remaining <= 0:
+            return
+        # A future mtime (clock step) counts as just written
+        time.sleep(min(FLUSH_QUIET - max(idle, 0.0), remaining))
+
+
+def _record_timestamp(line):
+    """Return the timestamp of one raw JSONL line, or None."""
+    try:
+        return json.loads(line).get("timestamp")
+    except (ValueError, AttributeError):
+        return None
+
+
+def first_timestamp(path):
+    """Return the timestamp of the first record that has one, or None.
+
+    Reads raw bytes and stops at the first hit, so normally only the head
+    of the transcript is read. Each chunk is scanned once; the pieces of a
+    record that spans chunks are only joined when its newline turns up.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        pending = []
+        while True:
+            chunk = os.read(fd, TIMESTAMP_READ_SIZE)
+            if not chunk:
+                return _record_timestamp(b"".join(pending)) if pending else None
+            start = 0
+            nl = chunk.find(b"\n")
+            while nl >= 0:
+                line = chunk[start:nl]
+                if pending:
+                    pending.append(line)
+                    line = b"".join(pending)
+                    pending = []
+                ts = _record_timestamp(line)
+                if ts:
+                    return ts
+                start = nl + 1
+                nl = chunk.find(b"\n", start)
+            if start < len(chunk):
+                pending.append(chunk[start:])
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def _is_iso_prefix(ts):
+    """True if ts starts with YYYY-MM-DDTHH:MM:SS."""
+    return (len(ts) >= 19 and ts[4] == "-" and ts[7] == "-" and ts[10] == "T"
+            and ts[13] == ":" and ts[16] == ":"
+            and (ts[:4] + ts[5:7] + ts[8:10] + ts[11:13] + ts[14:16]
+                 + ts[17:19]).isdecimal())
+
+
+def _parse_utc(ts):
+    """Parse an ISO timestamp, building "...Z" ones directly from the digits."""
+    if ts.endswith("Z"):
+        return datetime(int(ts[:4]), int(ts[5:7]), int(ts[8:10]),
+                        int(ts[11:13]), int(ts[14:16]), int(ts[17:19]),
+                        tzinfo=timezone.utc)
+    return datetime.fromisoformat(ts)
+
+
+def local_start(start_ts, tz):
+    """Return (date_str, time_part, local_ts) for a transcript start in tz.
+
+    date_str is YYYY-MM-DD and time_part HHMM, for the log filename;
+    local_ts is the local ISO time for the header. A missing or unparseable
+    timestamp falls back to today's date and 0000.
+    """
+    if start_ts:
+        try:
+            if _is_iso_prefix(start_ts):
+                utc_dt = _parse_utc(start_ts)
+                if tz in UTC_ZONES and utc_dt.tzinfo is timezone.utc:
+                    local_dt = utc_dt
+                else:
+                    local_dt = utc_dt.astimezone(ZoneInfo(tz))
+                date_str = f"{local_dt.year:04d}-{local_dt.month:02d}-{local_dt.day:02d}"
+                time_part = f"{local_dt.hour:02d}{local_dt.minute:02d}"
+                return date_str, time_part, local_dt.isoformat()
+            raise ValueError("no match")
+        except Exception:
+            return datetime.now().strftime("%Y-%m-%d"), "0000", start_ts
+    return datetime.now().strftime("%Y-%m-%d"), "0000", ""
@@ -4,18 +4,40 @@ Converts Claude Code JSONL transcripts into clean, readable markdown conversatio
 
 Usage:
     python log-converter.py --transcript PATH --output PATH
+    python log-converter.py --transcript PATH --output PATH --jsonl-sidecar PATH
+    python log-converter.py --batch < requests.jsonl
 
 Reads a Claude Code JSONL transcript file and produces a markdown document
-that mirrors the Claude Code chat UI as closely as possible.
+that mirrors the Claude Code chat UI as closely as possible. With
+--jsonl-sidecar, also writes the grouped conversation items as JSONL. With
+--batch, reads one JSON object per line on stdin, each holding convert()'s
+keyword arguments, and converts them all in one process.
 """
 
 import argparse
 import difflib
+import io
+import itertools
 import json
 import os
 import re
 import sys
 
+# orjson parses transcripts several times faster when available; the stdlib
+# parser is the fallback so the hooks keep working with no extra installs
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps_line(obj):
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_line(obj):
+        return (json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+                + "\n").encode("utf-8")
+
 
 # JSONL line types to skip entirely
 SKIP_TYPES = frozenset({
@@ -28,54 +50,80 @@ SKIP_TYPES = frozenset({
 # Max lines for inline result display (longer gets collapsed)
 INLINE_RESULT_MAX_LINES = 4
 
+# Write buffer size for the output markdown file
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+# Internal XML tags stripped from tool result text
+TOOL_USE_ERROR_RE = re.compile(r'</?tool_use_error>')
+
+# HH:MM portion of an ISO 8601 start timestamp
+START_TIME_RE = re.compile(r'T(\d{2}:\d{2})')
+
+# Single-pass HTML entity escape/unescape tables
+HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+HTML_UNESCAPE_RE = re.compile(r'&(lt|gt|amp);')
+HTML_UNESCAPE_MAP = {"lt": "<", "gt": ">", "amp": "&"}
+
+# Context lines shown around each change in Edit diffs
+EDIT_DIFF_CONTEXT = 2
+
+# Unified diff hunk header, e.g. "@@ -3,4 +3,5 @@"
+HUNK_HEADER_RE = re.compile(r'^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@')
+
 
 def parse_jsonl(transcript_path):
-    """Parse JSONL file. Returns list of records."""
-    records = []
+    """Parse JSONL file lazily. Yields one record per valid line.
+
+    Lines are read as bytes and handed straight to the JSON parser, which
+    skips a separate text decoding pass.
+    """
     try:
-        with open(transcript_path, "r") as f:
+        with open(transcript_path, "rb") as f:
             for raw_line in f:
                 raw_line = raw_line.strip()
                 if not raw_line:
                     continue
                 try:
-                    records.append(json.loads(raw_line))
-                except json.JSONDecodeError:
+                    yield _json_loads(raw_line)
+                except ValueError:
                     continue
     except FileNotFoundError:
         print(f"Error: Transcript file not found: {transcript_path}", file=sys.stderr)
         sys.exit(1)
-    return records
-
-
-def should_skip(record):
-    """Return True if this record should be skipped entirely."""
-    if record.get("type", "") in SKIP_TYPES:
-        return True
-    if record.get("isMeta"):
-        return True
-    return False
 
 
 def group_assistant_records(records):
     """
     Group consecutive assistant records that share the same message.id
     into a single logical response. Also preserves user records and
-    interleaves them properly.
+    interleaves them properly. Accepts any iterable of records, so the
+    transcript can be streamed straight from parse_jsonl.
 
-    Returns a list of items, each being either:
+    Returns (items, tool_results_map). items is a list, each being either:
       - ("user", text, timestamp)
-      - ("assistant", [content_blocks], timestamp)
+      - ("assistant", [content_blocks], timestamp)  (dict blocks only)
+      - ("tool_result", block, timestamp)
+    tool_results_map maps tool_use_id -> (content_str, is_error) so the
+    renderer can pair each tool call with its result in a single pass.
+    Result text is cleaned once here, so renderers use it as-is.
     """
     items = []
-    assistant_groups = {}  # msg_id -> {"blocks": [], "timestamp": str}
-    assistant_order = []  # list of msg_ids in order of first appearance
+    tool_results_map = {}  # tool_use_id -> (content_str, is_error)
+    pending = []  # [(blocks, timestamp)] in order of first appearance
+    pending_by_id = {}  # msg_id -> index into pending
+    # Indices in pending whose blocks list is our own copy. A group starts
+    # out sharing its record's content list and is only copied once a
+    # second record with the same id needs to be merged into it.
+    owned = set()
+    skip_types = SKIP_TYPES
 
     for record in records:
-        if should_skip(record):
+        # Skip non-conversation record types and meta records (checked
+        # inline: this loop runs once per transcript line)
+        rtype = record.get("type", "")
+        if rtype in skip_types or record.get("isMeta"):
             continue
 
-        rtype = record.get("type", "")
         msg = record.get("message", {})
         if not isinstance(msg, dict):
             continue
@@ -84,11 +132,10 @@ def group_assistant_records(records):
 
         if rtype == "user":
             # Flush any pending assistant groups before this user message
-            for mid in assistant_order:
-                grp = assistant_groups[mid]
-                items.append(("assistant", grp["blocks"], grp["timestamp"]))
-            assistant_groups.clear()
-            assistant_order.clear()
+            items.extend(("assistant", blocks, ts) for blocks, ts in pending)
+            pending.clear()
+            pending_by_id.clear()
+            owned.clear()
 
             content = msg.get("content", "")
             role = msg.get("role", "")
@@ -116,45 +163,61 @@ def group_assistant_records(records):
                         items.append(("user", "\n".join(text_parts), timestamp))
                     for tr in tool_results:
                         items.append(("tool_result", tr, timestamp))
+                        tid = tr.get("tool_use_id", "")
+                        if tid:
+                            content = _clean_result_text(
+                                format_tool_result_content(
+                                    tr.get("content", "")
+                                )
+                            )
+                            tool_results_map[tid] = (
+                                content, tr.get("is_error", False)
+                            )
 
         elif rtype == "assistant":
             msg_id = msg.get("id", "")
             content = msg.get("content", [])
             if not isinstance(content, list):
                 continue
-
-            if msg_id and msg_id in assistant_groups:
-                assistant_groups[msg_id]["blocks"].extend(content)
+            # Drop non-dict blocks here so the renderer never has to check;
+            # only copy when there is actually something to drop
+            if not all(isinstance(block, dict) for block in content):
+                content = [block for block in content
+                           if isinstance(block, dict)]
+
+            if msg_id and msg_id in pending_by_id:
+                idx = pending_by_id[msg_id]
+                blocks, ts = pending[idx]
+                if idx not in owned:
+                    blocks = list(blocks)
+                    pending[idx] = (blocks, ts)
+                    owned.add(idx)
+                blocks.extend(content)
             else:
-                key = msg_id or id(record)
-                assistant_groups[key] = {
-                    "blocks": list(content),
-                    "timestamp": timestamp,
-                }
-                assistant_order.append(key)
+                if msg_id:
+                    pending_by_id[msg_id] = len(pending)
+                pending.append((content, timestamp))
 
     # Flush remaining assistant groups
-    for mid in assistant_order:
-        grp = assistant_groups[mid]
-        items.append(("assistant", grp["blocks"], grp["timestamp"]))
+    items.extend(("assistant", blocks, ts) for blocks, ts in pending)
 
-    return items
+    return items, tool_results_map
 
 
 def _clean_result_text(text):
     """Strip internal XML tags like <tool_use_error> from result text."""
-    text = re.sub(r'</?tool_use_error>', '', text)
+    text = TOOL_USE_ERROR_RE.sub('', text)
     return text.strip()
 
 
 def _escape_html(text):
     """Escape HTML entities for use inside HTML tags."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.translate(HTML_ESCAPE_TABLE)
 
 
 def _unescape_html(text):
     """Unescape HTML entities back to literal characters for markdown output."""
-    return text.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+    return HTML_UNESCAPE_RE.sub(lambda m: HTML_UNESCAPE_MAP[m.group(1)], text)
 
 
 def _truncate(text, max_len):
@@ -164,54 +227,51 @@ def _truncate(text, max_len):
     return text[:max_len] + "..."
 
 
-def _tool_header(name, inp):
-    """
-    Format a one-line tool call header matching the chat UI style.
-    Returns a markdown string safe for rendering.
-    """
-    if not isinstance(inp, dict):
-        return f"● {name}"
+def _bash_header(inp):
+    cmd = inp.get("command", "").split("\n")[0]
+    return f"● `Bash({_truncate(cmd, 120)})`"
 
-    if name == "Bash":
-        cmd = inp.get("command", "").split("\n")[0]
-        return f"● `Bash({_truncate(cmd, 120)})`"
 
-    if name == "Read":
-        path = inp.get("file_path", "")
-        return f"● `Read({path})`"
+def _grep_header(inp):
+    pattern = inp.get("pattern", "")
+    if pattern:
+        return f"● Searched for `{_truncate(pattern, 80)}`"
+    return "● Searched codebase"
 
-    if name == "Write":
-        path = inp.get("file_path", "")
-        return f"● `Write({path})`"
 
-    if name == "Edit":
-        path = inp.get("file_path", "")
-        return f"● `Update({path})`"
+def _task_header(inp):
+    desc = inp.get("description", "")
+    agent = inp.get("subagent_type", "")
+    if agent:
+        return f"● `Task({agent}: {_truncate(desc, 100)})`"
+    return f"● `Task({_truncate(desc, 100)})`"
 
-    if name == "Glob":
-        pattern = inp.get("pattern", "")
-        return f"● `Glob({pattern})`"
 
-    if name == "Grep":
-        pattern = inp.get("pattern", "")
-        if pattern:
-            return f"● Searched for `{_truncate(pattern, 80)}`"
-        return "● Searched codebase"
+# Tool name -> header formatter taking the tool input dict
+TOOL_HEADER_FORMATTERS = {
+    "Bash": _bash_header,
+    "Read": lambda inp: f"● `Read({inp.get('file_path', '')})`",
+    "Write": lambda inp: f"● `Write({inp.get('file_path', '')})`",
+    "Edit": lambda inp: f"● `Update({inp.get('file_path', '')})`",
+    "Glob": lambda inp: f"● `Glob({inp.get('pattern', '')})`",
+    "Grep": _grep_header,
+    "WebFetch": lambda inp: f"● `WebFetch({_truncate(inp.get('url', ''), 100)})`",
+    "WebSearch": lambda inp: f"● `WebSearch({inp.get('query', '')})`",
+    "Task": _task_header,
+}
 
-    if name == "WebFetch":
-        url = inp.get("url", "")
-        return f"● `WebFetch({_truncate(url, 100)})`"
 
-    if name == "WebSearch":
-        query = inp.get("query", "")
-        return f"● `WebSearch({query})`"
+def _tool_header(name, inp):
+    """
+    Format a one-line tool call header matching the chat UI style.
+    Returns a markdown string safe for rendering.
+    """
+    if not isinstance(inp, dict):
+        return f"● {name}"
 
-    if name == "Task":
-        desc = inp.get("description", "")
-        agent = inp.get("subagent_type", "")
-        if agent:
-            return f"● `Task({agent}: {_truncate(desc, 100)})`"
-        return f"● `Task({_truncate(desc, 100)})`"
+    formatter = TOOL_HEADER_FORMATTERS.get(name)
+    if formatter:
+        return formatter(inp)
 
     # Generic fallback
     return f"● {name}"
@@ -237,75 +297,144 @@ def format_tool_result_content(content):
     return str(content) if content else ""
 
 
-def _render_result_inline(lines, content, is_error=False):
-    """Render a short tool result as indented lines under the tool header."""
-    result_lines = content.split("\n")
+def _render_result_inline(out, result_lines, is_error=False):
+    """Render pre-split short tool result lines under the tool header."""
     prefix = "  ⎿  **Error:** " if is_error else "  ⎿  "
     cont_prefix = "     "
     for i, rline in enumerate(result_lines):
-        lines.append(f"{prefix}{rline}" if i == 0 else f"{cont_prefix}{rline}")
-    lines.append("")
+        out.write(prefix if i == 0 else cont_prefix)
+        out.write(rline)
+        out.write("\n")
+    out.write("\n")
 
 
-def _render_result_collapsed(lines, content, summary_text, is_error=False):
+def _render_result_collapsed(out, content, summary_text, is_error=False):
     """Render a long tool result as a collapsible <details> block."""
     if is_error:
         summary_text = f"<b>Error:</b> {summary_text}"
-    lines.append(f"<details>")
-    lines.append(f"<summary>{summary_text}</summary>")
-    lines.append(f"<pre><code>{_escape_html(content)}</code></pre>")
-    lines.append(f"</details>")
-    lines.append("<br>")
-    lines.append("")
+    out.write("<details>\n")
+    out.write(f"<summary>{summary_text}</summary>\n")
+    out.write("<pre><code>")
+    out.write(_escape_html(content))
+    out.write("</code></pre>\n")
+    out.write("</details>\n")
+    out.write("<br>\n")
+    out.write("\n")
 
 
-def _render_tool_with_result(lines, header, result_content, is_error=False):
+def _render_tool_with_result(out, header, content, is_error=False):
     """
     Render a tool call header paired with its result.
     Short results: header on one line, ⎿ result below.
     Long results: <details> block with header as the summary (no standalone header).
+    content is expected to be cleaned already (see tool_results_map).
     """
-    content = _clean_result_text(result_content) if result_content else ""
-
     if not content:
         # No result — just the header
-        lines.append(header)
-        lines.append("")
+        out.write(header)
+        out.write("\n\n")
         return
 
     result_lines = content.split("\n")
 
     if len(result_lines) <= INLINE_RESULT_MAX_LINES:
-        lines.append(header)
-        _render_result_inline(lines, content, is_error)
+        out.write(header)
+        out.write("\n")
+        _render_result_inline(out, result_lines, is_error)
     else:
         # Collapsed: <details><summary> IS the header — no standalone line
         summary = _escape_html(header)
-        _render_result_collapsed(lines, content, summary, is_error)
+        _render_result_collapsed(out, content, summary, is_error)
+
+
+def _leading_context(lines):
+    """Count the context (" ") lines at the start of an iterable of diff lines."""
+    count = 0
+    for line in lines:
+        if not line.startswith(" "):
+            break
+        count += 1
+    return count
 
 
-def render_markdown(items):
+def _edit_diff_lines(old, new):
+    """
+    Return the unified diff body (no ---/+++ file headers) for an Edit.
+
+    Lines shared at the start and end of both strings are trimmed before
+    handing off to difflib, keeping only the context the hunks need, so
+    SequenceMatcher only sees the changed region. Hunk headers are shifted
+    back by the trimmed prefix so they give line numbers in the full text.
+
+    Where lines repeat around the edit, difflib may place the change inside
+    the kept context, leaving its edge hunk short of context; the full text
+    is diffed instead in that case. The trimmed diff can still align such
+    repeated lines differently than a full-text diff would.
+    """
+    if old == new:
+        return []
+
+    old_lines = old.splitlines()
+    new_lines = new.splitlines()
+
+    # Common prefix/suffix lengths (suffix never overlaps the prefix)
+    limit = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and old_lines[-1 - suffix] == new_lines[-1 - suffix]):
+        suffix += 1
+
+    start = max(prefix - EDIT_DIFF_CONTEXT, 0)
+    tail = max(suffix - EDIT_DIFF_CONTEXT, 0)
+
+    body = [
+        line for line in difflib.unified_diff(
+            old_lines[start:len(old_lines) - tail],
+            new_lines[start:len(new_lines) - tail],
+            lineterm="",
+            n=EDIT_DIFF_CONTEXT,
+        )
+        if not line.startswith(("---", "+++"))
+    ]
+
+    if ((start and _leading_context(body[1:]) < EDIT_DIFF_CONTEXT)
+            or (tail and _leading_context(reversed(body)) < EDIT_DIFF_CONTEXT)):
+        return [
+            line for line in difflib.unified_diff(
+                old_lines, new_lines, lineterm="", n=EDIT_DIFF_CONTEXT,
+            )
+            if not line.startswith(("---", "+++"))
+        ]
+
+    if start:
+        for i, line in enumerate(body):
+            if line.startswith("@@"):
+                m = HUNK_HEADER_RE.match(line)
+                if m:
+                    body[i] = (f"@@ -{int(m.group(1)) + start}{m.group(2) or ''} "
+                               f"+{int(m.group(3)) + start}{m.group(4) or ''} @@")
+    return body
+
+
+def render_markdown(items, tool_results_map):
     """
     Render grouped items into clean markdown conversation text.
 
-    Uses a two-pass approach: first collects tool results by tool_use_id,
-    then renders each tool_use paired with its result. This ensures each
-    tool call is visually grouped with its result, even for parallel calls.
+    tool_results_map (built by group_assistant_records) is used to render
+    each tool_use paired with its result. This ensures each tool call is
+    visually grouped with its result, even for parallel calls.
+
+    Output is written line by line into a StringIO buffer; every line is
+    terminated with a newline as it is written, so the trailing newline of
+    the final (always blank) line is dropped on return.
     """
-    lines = []
+    out = io.StringIO()
+    # Whether the last line written was blank (nothing written counts too)
+    last_was_blank = True
 
-    # First pass: collect tool results keyed by tool_use_id
-    tool_results_map = {}  # tool_use_id -> (content_str, is_error)
-    for item in items:
-        if item[0] == "tool_result":
-            tr = item[1]
-            content = format_tool_result_content(tr.get("content", ""))
-            content = content.strip()
-            tid = tr.get("tool_use_id", "")
-            if tid:
-                tool_results_map[tid] = (content, tr.get("is_error", False))
-
-    # Second pass: render
     for item in items:
         kind = item[0]
 
@@ -316,38 +445,33 @@ def render_markdown(items):
             if text.startswith(
                 "This session is being continued from a previous"
             ):
-                lines.append(
+                out.write(
                     "**Context restored from previous session "
-                    "(ran out of context):**"
+                    "(ran out of context):**\n"
                 )
-                quoted = "\n".join(
-                    f"> {line}" for line in text.split("\n")
-                )
-                lines.append("<details>")
-                lines.append("<summary>Session summary</summary>")
-                lines.append("")
-                lines.append(quoted)
-                lines.append("")
-                lines.append("</details>")
-                lines.append("<br>")
-                lines.append("")
+                quoted = "> " + text.replace("\n", "\n> ")
+                out.write("<details>\n")
+                out.write("<summary>Session summary</summary>\n")
+                out.write("\n")
+                out.write(quoted)
+                out.write("\n\n")
+                out.write("</details>\n")
+                out.write("<br>\n")
+                out.write("\n")
             else:
-                quoted = "\n".join(
-                    f"> {line}" for line in text.split("\n")
-                )
-                lines.append(f"**User:**\n{quoted}")
-                lines.append("")
+                quoted = "> " + text.replace("\n", "\n> ")
+                out.write("**User:**\n")
+                out.write(quoted)
+                out.write("\n\n")
+            last_was_blank = True
 
         elif kind == "tool_result":
-            # Already paired with tool_use in the second pass
+            # Already paired with its tool_use via tool_results_map
             continue
 
         elif kind == "assistant":
             blocks = item[1]
             for block in blocks:
-                if not isinstance(block, dict):
-                    continue
-
                 btype = block.get("type", "")
 
                 if btype == "thinking":
@@ -357,10 +481,11 @@ def render_markdown(items):
                     text = _unescape_html(block.get("text", "").strip())
                     if not text:
                         continue
-                    if lines and lines[-1] != "":
-                        lines.append("")
-                    lines.append(text)
-                    lines.append("")
+                    if not last_was_blank:
+                        out.write("\n")
+                    out.write(text)
+                    out.write("\n\n")
+                    last_was_blank = True
 
                 elif btype == "tool_use":
                     tool_name = block.get("name", "unknown")
@@ -375,39 +500,35 @@ def render_markdown(items):
 
                     # Edit tool: always show header + diff, then inline result
                     if tool_name == "Edit":
-                        lines.append(header)
+                        out.write(header)
+                        out.write("\n")
                         old = tool_input.get("old_string", "")
                         new = tool_input.get("new_string", "")
                         if old or new:
-                            diff_lines = list(difflib.unified_diff(
-                                old.splitlines(),
-                                new.splitlines(),
-                                lineterm="",
-                                n=2,
-                            ))
-                            diff_body = [l for l in diff_lines
-                                         if not l.startswith(("---", "+++"))]
+                            diff_body = _edit_diff_lines(old, new)
                             if diff_body:
-                                lines.append("```diff")
-                                lines.extend(diff_body)
-                                lines.append("```")
+                                out.write("```diff\n")
+                                out.write("\n".join(diff_body))
+                                out.write("\n```\n")
                         if result_content:
-                            result_content = _clean_result_text(result_content)
-                            _render_result_inline(lines, result_content,
+                            _render_result_inline(out,
+                                                  result_content.split("\n"),
                                                   result_is_error)
                         else:
-                            lines.append("")
+                            out.write("\n")
                     else:
                         # All other tools: header paired with result
-                        _render_tool_with_result(lines, header,
+                        _render_tool_with_result(out, header,
                                                  result_content,
                                                  result_is_error)
+                    last_was_blank = True
 
             # Ensure blank line after assistant block
-            if lines and lines[-1] != "":
-                lines.append("")
+            if not last_was_blank:
+                out.write("\n")
+                last_was_blank = True
 
-    return "\n".join(lines)
+    return out.getvalue()[:-1]
 
 
 def render_header(session_id=None, date_str=None, start_time=None,
@@ -417,7 +538,7 @@ def render_header(session_id=None, date_str=None, start_time=None,
 
     date_display = date_str or "unknown date"
     if start_time:
-        m = re.search(r'T(\d{2}:\d{2})', start_time)
+        m = START_TIME_RE.search(start_time)
         if m:
             date_display += f" {m.group(1)}"
 
@@ -441,16 +562,94 @@ def render_header(session_id=None, date_str=None, start_time=None,
     return "\n".join(parts)
 
 
+def _sidecar_record(item, tool_results_map):
+    """Convert one grouped item into a JSON-serializable sidecar record."""
+    kind, payload, timestamp = item
+    if kind == "user":
+        return {"kind": kind, "timestamp": timestamp, "text": payload}
+    if kind == "tool_result":
+        tid = payload.get("tool_use_id", "")
+        if tid in tool_results_map:
+            content, is_error = tool_results_map[tid]
+        else:
+            content = _clean_result_text(
+                format_tool_result_content(payload.get("content", ""))
+            )
+            is_error = payload.get("is_error", False)
+        return {"kind": kind, "timestamp": timestamp, "tool_use_id": tid,
+                "is_error": bool(is_error), "content": content}
+    return {"kind": kind, "timestamp": timestamp, "blocks": payload}
+
+
+def write_jsonl_sidecar(path, items, tool_results_map):
+    """
+    Write grouped items as JSONL, one record per item.
+
+    All lines are encoded up front and handed to a single writelines call,
+    so the file is written in one batch instead of one write per item.
+    """
+    batch = [_json_dumps_line(_sidecar_record(item, tool_results_map))
+             for item in items]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.writelines(batch)
+
+
+def convert(transcript, output, session_id=None, date=None, start_time=None,
+            agent_type=None, agent_id=None, jsonl_sidecar=None):
+    """Convert a JSONL transcript into a markdown log written to output.
+
+    This is what the command line runs; the stop hooks import the module and
+    call it directly to avoid starting a second interpreter.
+    """
+    records = parse_jsonl(transcript)
+
+    # Peek at the first record to detect an empty transcript without
+    # materializing the whole stream
+    first = next(records, None)
+    if first is None:
+        if not os.path.exists(output):
+            os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+            with open(output, "w") as f:
+                f.write("")
+        if jsonl_sidecar and not os.path.exists(jsonl_sidecar):
+            write_jsonl_sidecar(jsonl_sidecar, [], {})
+        return
+
+    items, tool_results_map = group_assistant_records(
+        itertools.chain((first,), records)
+    )
+    header = render_header(session_id, date, start_time, agent_type, agent_id)
+    body = render_markdown(items, tool_results_map)
+
+    # Write header and body separately rather than concatenating the whole
+    # log into one more string; the large buffer keeps it to few syscalls
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(header)
+        f.write(body)
+
+    if jsonl_sidecar:
+        write_jsonl_sidecar(jsonl_sidecar, items, tool_results_map)
+
+
+def convert_batch(stream):
+    """Run convert() once per JSON line in stream; keys are its arguments."""
+    for line in stream:
+        if line.strip():
+            convert(**json.loads(line))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert Claude Code JSONL transcript to clean markdown."
     )
     parser.add_argument(
-        "--transcript", required=True,
+        "--transcript", default=None,
         help="Path to the JSONL transcript file",
     )
     parser.add_argument(
-        "--output", required=True,
+        "--output", default=None,
         help="Path to the output markdown file",
     )
     parser.add_argument(
@@ -473,25 +672,24 @@ def main():
         "--agent-id", default=None,
         help="Subagent ID for subagent logs",
     )
+    parser.add_argument(
+        "--jsonl-sidecar", default=None,
+        help="Also write the grouped conversation items to this JSONL file",
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Read one JSON request per line on stdin and convert each",
+    )
     args = parser.parse_args()
 
-    records = parse_jsonl(args.transcript)
-
-    if not records:
-        if not os.path.exists(args.output):
-            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
-            with open(args.output, "w") as f:
-                f.write("")
+    if args.batch:
+        convert_batch(sys.stdin)
         return
+    if not args.transcript or not args.output:
+        parser.error("--transcript and --output are required")
 
-    items = group_assistant_records(records)
-    header = render_header(args.session_id, args.date, args.start_time,
-                           args.agent_type, args.agent_id)
-    body = render_markdown(items)
-
-    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
-    with open(args.output, "w") as f:
-        f.write(header + body)
+    convert(args.transcript, args.output, args.session_id, args.date,
+            args.start_time, args.agent_type, args.agent_id, args.jsonl_sidecar)
 
 
 if __name__ == "__main__":
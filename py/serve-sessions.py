@@ -12,42 +12,82 @@ Usage:
     python3 serve-sessions.py --host 0.0.0.0       # expose to network
     python3 serve-sessions.py --cert C --key K     # custom cert
     python3 serve-sessions.py --dir .claude/logs   # custom log directory
+    python3 serve-sessions.py --asset-dir DIR      # custom asset cache
+    python3 serve-sessions.py --no-fetch-assets    # never download assets
 """
 
 import argparse
 import atexit
+import email.utils
+import hashlib
 import html
 import json
+import mmap
 import os
-import re
 import shutil
 import signal
 import ssl
+import stat
 import subprocess
 import sys
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import unquote
 
+# cryptography lets us mint the self-signed cert in-process with a P-256 key;
+# without it we fall back to shelling out to openssl
+try:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+except ImportError:
+    x509 = None
+
 DEFAULT_PORT = 9443
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_DIR = os.path.join(".claude", "logs")
 DEFAULT_CERT_DIR = os.path.join(".claude", "certs")
 PID_FILE = os.path.join(".claude", "serve-sessions.pid")
+DEFAULT_ASSET_DIR = os.path.join(".claude", "assets")
 CERT_FILE = "localhost.pem"
 KEY_FILE = "localhost-key.pem"
 
-# Strict filename pattern: YYYY-MM-DD-HHMM-{session}[-subagent-{type}-{agent}]
-LOG_NAME_RE = re.compile(
-    r"^(\d{4}-\d{2}-\d{2})-(\d{4})-(\w+?)(?:-subagent-(.+)-(\w+))?$"
-)
+# Strict filename shape: YYYY-MM-DD-HHMM-{session}[-subagent-{type}-{agent}]
+# Parsed by hand in parse_log_name; the fixed-width prefix is 16 characters.
+LOG_NAME_PREFIX_LEN = 16
+SUBAGENT_SEP = "-subagent-"
 
-# Label regex for first line of log:
+# Label line shape, parsed by hand in read_label:
 # # Session `abc123` — 2026-02-17 18:56 — My Label
 # # Subagent: Explore `dddd1111` — 2026-02-17 19:00 — My Label
-LABEL_RE = re.compile(
-    r"^#\s+(?:Session|Subagent:\s+\S+)\s+.+?\u2014\s+\d{4}-\d{2}-\d{2}"
-    r"(?:\s+\d{2}:\d{2})?\s*\u2014\s+(.+)$"
-)
+EM_DASH = "\u2014"
+
+# Escape table for the transcript body, which only ever lands inside <pre>,
+# so quotes can stay as-is
+HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Front-end assets for rendered pages, served from /assets/. Each is fetched
+# once from the CDN into the asset dir; until then /assets/ redirects there.
+ASSETS = {
+    "marked.min.js": (
+        "https://cdn.jsdelivr.net/npm/marked/marked.min.js",
+        "application/javascript; charset=utf-8",
+    ),
+    "github-markdown-dark.min.css": (
+        "https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-dark.min.css",
+        "text/css; charset=utf-8",
+    ),
+    "github-markdown-light.min.css": (
+        "https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-light.min.css",
+        "text/css; charset=utf-8",
+    ),
+}
+ASSET_FETCH_TIMEOUT = 10
+# How long shutdown waits for an in-flight asset fetch to notice it should stop
+ASSET_STOP_TIMEOUT = 1.0
 
 HTML_TEMPLATE = """\
 <!DOCTYPE html>
@@ -56,8 +96,8 @@ HTML_TEMPLATE = """\
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1">
 <title>{title}</title>
-<link id="md-css" rel="stylesheet" href="https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-dark.min.css">
-<script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>
+<link id="md-css" rel="stylesheet" href="/assets/github-markdown-dark.min.css">
+<script src="/assets/marked.min.js"></script>
 <style>
   html[data-theme="dark"] body {{
     background: #0d1117;
@@ -118,8 +158,8 @@ HTML_TEMPLATE = """\
     document.querySelector('.theme-toggle').textContent = theme === 'dark' ? '\u263c' : '\u263d';
     var css = document.getElementById('md-css');
     css.href = theme === 'dark'
-      ? 'https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-dark.min.css'
-      : 'https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown-light.min.css';
+      ? '/assets/github-markdown-dark.min.css'
+      : '/assets/github-markdown-light.min.css';
   }}
   function toggleTheme() {{
     setTheme(document.documentElement.dataset.theme === 'dark' ? 'light' : 'dark');
@@ -234,56 +274,233 @@ INDEX_TEMPLATE = """\
 """
 
 
+# Templates pre-split around their substitution points and pre-encoded, so
+# each response is a join of bytes rather than a re-format of the whole page.
+# Formatting with a NUL sentinel also turns the {{ }} escapes back into braces.
+_PAGE_HEAD, _PAGE_MID, _PAGE_TAIL = (
+    part.encode("utf-8")
+    for part in HTML_TEMPLATE.format(title="\0", content="\0").split("\0")
+)
+_INDEX_HEAD, _INDEX_TAIL = (
+    part.encode("utf-8")
+    for part in INDEX_TEMPLATE.format(entries="\0").split("\0")
+)
+
+# Last rendered index page, keyed by the listing signature it was built from
+_index_cache = {"signature": None, "html": None, "etag": None}
+
+# Log file path -> (mtime_ns, size, label) so unchanged files are not re-read
+_label_cache = {}
+
+# Requests are served on worker threads; hold this while using the caches
+_index_lock = threading.Lock()
+
+
+def _stat_file(path):
+    """Return os.stat(path) if it is a regular file, else None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _file_etag(st, variant=""):
+    """Strong ETag for a file's current contents, from its mtime and size."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}{variant}"'
+
+
+def _is_word(s):
+    """True if s is non-empty and every character would match regex \\w."""
+    return bool(s) and s.replace("_", "a").isalnum()
+
+
+def _is_date(s):
+    """True if s is shaped like YYYY-MM-DD."""
+    return (len(s) == 10 and s[4] == "-" and s[7] == "-"
+            and s[:4].isdecimal() and s[5:7].isdecimal() and s[8:].isdecimal())
+
+
 def parse_log_name(filename):
     """Extract metadata from a log filename. Returns None if name doesn't match."""
     name = filename.replace(".md", "")
-    m = LOG_NAME_RE.match(name)
-    if not m:
+    if len(name) <= LOG_NAME_PREFIX_LEN or name[10] != "-" or name[15] != "-":
+        return None
+    date = name[:10]
+    time_part = name[11:15]
+    if not (_is_date(date) and time_part.isdecimal()):
         return None
-    time_part = m.group(2)
+    rest = name[LOG_NAME_PREFIX_LEN:]
+    session, sep, tail = rest.partition("-")
+    if not _is_word(session):
+        return None
+    agent_type = agent_id = None
+    if sep:
+        # The session can't contain "-", so anything after it must be a
+        # subagent suffix whose id follows the last "-".
+        if not tail.startswith(SUBAGENT_SEP[1:]):
+            return None
+        agent_type, _, agent_id = tail[len(SUBAGENT_SEP) - 1:].rpartition("-")
+        if not agent_type or not _is_word(agent_id):
+            return None
     return {
         "raw": name,
-        "date": m.group(1),
+        "date": date,
         "time": f"{time_part[:2]}:{time_part[2:]}",
-        "session": m.group(3),
-        "agent_type": m.group(4),
-        "agent_id": m.group(5),
+        "session": session,
+        "agent_type": agent_type,
+        "agent_id": agent_id,
     }
 
 
+def _skip_space(line, i):
+    """Return the index of the first non-whitespace character at or after i."""
+    n = len(line)
+    while i < n and line[i].isspace():
+        i += 1
+    return i
+
+
+def _label_after_dash(line, i):
+    """Return the label if `DATE [HH:MM] — LABEL` follows the em dash before i."""
+    j = _skip_space(line, i)
+    if j == i or not _is_date(line[j:j + 10]):
+        return None
+    j += 10
+    k = _skip_space(line, j)
+    clock = line[k:k + 5]
+    if (k > j and len(clock) == 5 and clock[2] == ":"
+            and clock[:2].isdecimal() and clock[3:].isdecimal()):
+        j = k + 5
+    j = _skip_space(line, j)
+    if not line.startswith(EM_DASH, j):
+        return None
+    j += 1
+    k = _skip_space(line, j)
+    if k == j:
+        return None
+    if k == len(line):
+        # All trailing whitespace: the label group keeps whatever is left
+        # after the one space the separator needs.
+        return line[j + 1:] if k - j >= 2 else None
+    return line[k:]
+
+
+def parse_label_line(line):
+    """Extract the label from a log's header line, or None if it has none.
+
+    The label follows the second em dash, after the date and optional time;
+    the label itself may contain further em dashes.
+    """
+    if not line.startswith("#"):
+        return None
+    i = _skip_space(line, 1)
+    if i == 1:
+        return None
+    if line.startswith("Session", i):
+        i += 7
+    elif line.startswith("Subagent:", i):
+        i += 9
+        j = _skip_space(line, i)
+        if j == i:
+            return None
+        i = j
+        while i < len(line) and not line[i].isspace():
+            i += 1
+        if i == j:
+            return None
+    else:
+        return None
+    if not line[i:i + 1].isspace():
+        return None
+    # The text before the first em dash (the session id) needs at least one
+    # character after the whitespace that follows the keyword.
+    pos = line.find(EM_DASH, i + 2)
+    while pos != -1:
+        label = _label_after_dash(line, pos + 1)
+        if label is not None:
+            return label.strip()
+        pos = line.find(EM_DASH, pos + 1)
+    return None
+
+
 def read_label(filepath):
     """Read the first line of a log file and extract an optional label."""
     try:
         with open(filepath, "r") as f:
             first_line = f.readline().rstrip()
-        m = LABEL_RE.match(first_line)
-        return m.group(1).strip() if m else None
+        return parse_label_line(first_line)
     except (OSError, UnicodeDecodeError):
         return None
 
 
+def _cached_label(filepath, st):
+    """Return the label for a log file, re-reading it only if it changed."""
+    cached = _label_cache.get(filepath)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    label = read_label(filepath)
+    _label_cache[filepath] = (st.st_mtime_ns, st.st_size, label)
+    return label
+
+
+def read_text_mapped(filepath):
+    """Read a UTF-8 text file through mmap, decoding straight from the map."""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, "utf-8", "replace")
+
+
 def build_index(log_dir):
-    """Build the index HTML page."""
+    """Build the index HTML page. Returns (UTF-8 encoded bytes, ETag).
+
+    The rendered page is cached and reused for as long as the set of log
+    files and their (mtime, size) stay the same. Logs are rewritten in
+    place after every turn, which does not touch the directory mtime, so
+    each file's stat is part of the cache key rather than the directory's.
+    """
+    # DirEntry.is_file() comes from d_type, so directories are filtered out
+    # without a stat; entry.stat() below is the only per-file syscall
     try:
-        files = [f for f in os.listdir(log_dir)
-                 if f.endswith(".md") and not f.startswith(".")]
+        with os.scandir(log_dir) as it:
+            files = [e for e in it
+                     if e.name.endswith(".md") and not e.name.startswith(".")
+                     and e.is_file()]
     except FileNotFoundError:
         files = []
 
     # Filter to only well-formed filenames
     entries = []
-    for f in files:
-        meta = parse_log_name(f)
-        if meta is not None:
-            entries.append((f, meta))
+    for entry in files:
+        meta = parse_log_name(entry.name)
+        if meta is None:
+            continue
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        entries.append((entry, meta, st))
+
+    entries.sort(key=lambda x: x[0].name, reverse=True)
+
+    signature = (log_dir, tuple((e.name, st.st_mtime_ns, st.st_size)
+                                for e, _, st in entries))
+    if _index_cache["signature"] == signature:
+        return _index_cache["html"], _index_cache["etag"]
 
-    entries.sort(key=lambda x: x[0], reverse=True)
+    # Forget labels for files that are gone
+    live = {e.path for e, _, _ in entries}
+    for stale in [p for p in _label_cache if p not in live]:
+        del _label_cache[stale]
 
     if not entries:
         html_entries = '<p class="empty">No session logs found.</p>'
     else:
         parts = []
-        for f, meta in entries:
+        for entry, meta, st in entries:
+            f = entry.name
             date_time = f'{meta["date"]} {meta["time"]}'
             label_text = f'{date_time} &mdash; {meta["session"]}'
             if meta["agent_type"]:
@@ -292,7 +509,7 @@ def build_index(log_dir):
                                f'</span>')
 
             # Check for label in file header
-            file_label = read_label(os.path.join(log_dir, f))
+            file_label = _cached_label(entry.path, st)
             if file_label:
                 label_text += (f'<span class="label">'
                                f'{html.escape(file_label)}'
@@ -312,62 +529,227 @@ def build_index(log_dir):
             )
         html_entries = "\n".join(parts)
 
-    return INDEX_TEMPLATE.format(entries=html_entries)
+    page = b"".join((_INDEX_HEAD, html_entries.encode("utf-8"), _INDEX_TAIL))
+    etag = '"%s"' % hashlib.blake2b(repr(signature).encode("utf-8"),
+                                    digest_size=8).hexdigest()
+    _index_cache["signature"] = signature
+    _index_cache["html"] = page
+    _index_cache["etag"] = etag
+    return page, etag
 
 
 class LogHandler(BaseHTTPRequestHandler):
     """HTTP(S) request handler for session logs."""
 
     log_dir = DEFAULT_DIR
+    asset_dir = DEFAULT_ASSET_DIR
+
+    # Buffer writes so a response's headers and body go out in a single send,
+    # and disable Nagle so that send isn't held back waiting for an ACK
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        # The TLS handshake is deferred to this worker thread. A client that
+        # rejects the self-signed cert, or speaks plain HTTP to the HTTPS
+        # port, is dropped quietly, as it was when accept() did the handshake
+        if isinstance(self.connection, ssl.SSLSocket):
+            try:
+                self.connection.do_handshake()
+            except OSError:
+                return
+        super().handle()
 
     def do_GET(self):
         path = unquote(self.path).lstrip("/")
 
         # Index
         if not path:
-            body = build_index(self.log_dir)
-            self._respond(200, body, "text/html")
+            with _index_lock:
+                body, etag = build_index(self.log_dir)
+            if not self._not_modified(etag):
+                self._respond(200, body, "text/html", (etag, None))
+            return
+
+        # Front-end assets: /assets/name
+        if path.startswith("assets/"):
+            asset = ASSETS.get(path[len("assets/"):])
+            if asset is None:
+                self._respond(404, "Not found", "text/plain")
+                return
+            url, content_type = asset
+            local = os.path.join(self.asset_dir, path[len("assets/"):])
+            if os.path.isfile(local):
+                self._send_file(local, content_type)
+            else:
+                self.send_response(302)
+                self.send_header("Location", url)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
             return
 
         # Raw markdown: /filename.md
         if path.endswith(".md"):
             file_path = os.path.join(self.log_dir, os.path.basename(path))
-            if os.path.isfile(file_path):
-                with open(file_path, "r") as f:
-                    content = f.read()
-                self._respond(200, content, "text/plain; charset=utf-8")
-            else:
+            st = _stat_file(file_path)
+            if st is None:
                 self._respond(404, "Not found", "text/plain")
+                return
+            validators = (_file_etag(st), st.st_mtime)
+            if not self._not_modified(*validators):
+                self._send_file(file_path, "text/plain; charset=utf-8", validators)
             return
 
         # Rendered HTML: /filename (no .md)
         md_file = os.path.join(self.log_dir, os.path.basename(path) + ".md")
-        if os.path.isfile(md_file):
-            with open(md_file, "r") as f:
-                content = f.read()
+        st = _stat_file(md_file)
+        if st is not None:
+            validators = (_file_etag(st, "-html"), st.st_mtime)
+            if self._not_modified(*validators):
+                return
+            content = read_text_mapped(md_file)
             title = os.path.basename(path)
-            body = HTML_TEMPLATE.format(
-                title=html.escape(title),
-                content=html.escape(content),
-            )
-            self._respond(200, body, "text/html")
+            body = b"".join((
+                _PAGE_HEAD,
+                html.escape(title).encode("utf-8"),
+                _PAGE_MID,
+                content.translate(HTML_ESCAPE_TABLE).encode("utf-8"),
+                _PAGE_TAIL,
+            ))
+            self._respond(200, body, "text/html", validators)
             return
 
         self._respond(404, "Not found", "text/plain")
 
-    def _respond(self, code, body, content_type):
-        encoded = body.encode("utf-8")
+    def _not_modified(self, etag, mtime=None):
+        """Send a 304 and return True if the client's cached copy is current.
+
+        If-None-Match takes precedence; If-Modified-Since is only consulted
+        when the request has no ETag to compare.
+        """
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_none_match is not None:
+            tags = [t.strip() for t in if_none_match.split(",")]
+            fresh = "*" in tags or etag in tags
+        elif if_modified_since and mtime is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+                fresh = int(mtime) <= since.timestamp()
+            except (TypeError, ValueError):
+                fresh = False
+        else:
+            fresh = False
+        if fresh:
+            self.send_response(304)
+            self._send_validators((etag, mtime))
+            self.end_headers()
+        return fresh
+
+    def _send_validators(self, validators):
+        """Send the ETag/Last-Modified headers for an (etag, mtime) pair."""
+        etag, mtime = validators
+        self.send_header("ETag", etag)
+        if mtime is not None:
+            self.send_header("Last-Modified", email.utils.formatdate(mtime, usegmt=True))
+        # Logs keep changing while a session is live, so always revalidate
+        self.send_header("Cache-Control", "no-cache")
+
+    def _respond(self, code, body, content_type, validators=None):
+        """Send a complete response. body may be str or pre-encoded bytes.
+
+        validators is an optional (etag, mtime) pair for cacheable responses.
+        """
+        encoded = body if isinstance(body, bytes) else body.encode("utf-8")
         self.send_response(code)
         self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(encoded)))
         self.send_header("Access-Control-Allow-Origin", "*")
+        if validators:
+            self._send_validators(validators)
         self.end_headers()
         self.wfile.write(encoded)
 
+    def _send_file(self, file_path, content_type, validators=None):
+        """Stream a file as a 200 response without reading it into Python.
+
+        socket.sendfile() uses the kernel's zero-copy sendfile on plain HTTP
+        sockets and falls back to plain sends for TLS sockets. At most the
+        fstat size is sent; if the file shrank meanwhile (a hook rewriting
+        the log) the connection is closed so the short body is not mistaken
+        for a complete one.
+        """
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(size))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            if validators:
+                self._send_validators(validators)
+            self.end_headers()
+            if size:
+                self.wfile.flush()
+                if self.connection.sendfile(f, 0, size) < size:
+                    self.close_connection = True
+
     def log_message(self, fmt, *args):
         sys.stderr.write(f"  {args[0]} {args[1]}\n")
 
 
+def fetch_assets(asset_dir, stop=None):
+    """Download any missing front-end assets into asset_dir.
+
+    Failures are ignored; the /assets/ route keeps redirecting to the CDN
+    for anything that isn't on disk yet. Setting the optional stop event
+    ends the loop before the next download.
+    """
+    for name, (url, _) in ASSETS.items():
+        if stop is not None and stop.is_set():
+            return
+        dest = os.path.join(asset_dir, name)
+        if os.path.isfile(dest):
+            continue
+        try:
+            with urllib.request.urlopen(url, timeout=ASSET_FETCH_TIMEOUT) as resp:
+                data = resp.read()
+            os.makedirs(asset_dir, exist_ok=True)
+            # Write to a temp name first so a partial file is never served
+            tmp = f"{dest}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, dest)
+        except (OSError, ValueError):
+            continue
+
+
+def _generate_cert_in_process(cert_path, key_path):
+    """Write a self-signed localhost cert and P-256 key using cryptography."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=365))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key_pem)
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+
+
 def ensure_cert(cert_dir):
     """Ensure a self-signed cert exists, generating one if needed.
 
@@ -379,6 +761,12 @@ def ensure_cert(cert_dir):
     if os.path.isfile(cert_path) and os.path.isfile(key_path):
         return cert_path, key_path
 
+    if x509 is not None:
+        os.makedirs(cert_dir, exist_ok=True)
+        print(f"  Generating self-signed certificate in {cert_dir}/", flush=True)
+        _generate_cert_in_process(cert_path, key_path)
+        return cert_path, key_path
+
     # Try to generate with openssl
     if not shutil.which("openssl"):
         print("  [ERROR] No TLS certificate found and openssl is not installed.")
@@ -422,13 +810,21 @@ def main():
                         help="Path to TLS certificate file")
     parser.add_argument("--key", default=None,
                         help="Path to TLS private key file")
+    parser.add_argument("--asset-dir", default=DEFAULT_ASSET_DIR,
+                        help="Front-end asset cache (default: .claude/assets)")
+    parser.add_argument("--no-fetch-assets", action="store_false",
+                        dest="fetch_assets",
+                        help="Don't download missing assets into the asset dir")
     args = parser.parse_args()
 
     os.makedirs(args.dir, exist_ok=True)
 
     LogHandler.log_dir = args.dir
+    LogHandler.asset_dir = args.asset_dir
 
-    server = HTTPServer((args.host, args.port), LogHandler)
+    # One thread per connection so a slow client (or TLS handshake) does
+    # not hold up everyone else
+    server = ThreadingHTTPServer((args.host, args.port), LogHandler)
 
     protocol = "http"
     if not args.use_http:
@@ -440,7 +836,11 @@ def main():
 
         context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
         context.load_cert_chain(cert_path, key_path)
-        server.socket = context.wrap_socket(server.socket, server_side=True)
+        # Defer the handshake to the first read, which happens on the
+        # connection's worker thread rather than in the accept loop
+        server.socket = context.wrap_socket(
+            server.socket, server_side=True, do_handshake_on_connect=False,
+        )
         protocol = "https"
 
     host_display = "localhost" if args.host == "127.0.0.1" else args.host
@@ -450,7 +850,7 @@ def main():
     pid_info = {"pid": os.getpid(), "url": url}
     os.makedirs(os.path.dirname(PID_FILE), exist_ok=True)
     with open(PID_FILE, "w") as f:
-        json.dump(pid_info, f)
+        f.write(json.dumps(pid_info))
 
     def cleanup_pid():
         try:
@@ -468,11 +868,35 @@ def main():
     print(f"  Press Ctrl+C to stop.", flush=True)
     print(flush=True)
 
+    # Cache the front-end assets locally without delaying startup. Started
+    # only once startup has succeeded, so a failed start never exits while
+    # the fetch is still inside a blocking resolver call
+    stop_fetch = threading.Event()
+    fetcher = None
+    if args.fetch_assets:
+        fetcher = threading.Thread(
+            target=fetch_assets, args=(args.asset_dir, stop_fetch), daemon=True,
+        )
+        fetcher.start()
+
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n  Stopped.")
         server.server_close()
+    except SystemExit:
+        pass  # SIGTERM
+
+    # Interpreter shutdown must not catch the fetch thread inside a resolver
+    # or TLS call, which can crash the process. Give it a moment to finish;
+    # if it is still blocked, skip finalization altogether.
+    if fetcher is not None:
+        stop_fetch.set()
+        fetcher.join(ASSET_STOP_TIMEOUT)
+        if fetcher.is_alive():
+            cleanup_pid()
+            sys.stdout.flush()
+            os._exit(0)
 
 
 if __name__ == "__main__":
@@ -4,98 +4,74 @@ Reads hook input from stdin, extracts the transcript path, and calls
 log-converter.py to produce a readable markdown log. Exits 0 always.
 """
 
+import contextlib
+import importlib.util
 import json
 import os
-import re
-import subprocess
 import sys
-import time
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
+import traceback
 
 TZ = os.environ.get("TZ", "__TZ__")
 
 
+def _load_sibling(filename, name):
+    """Import a script from the hooks dir (its name isn't importable).
+
+    Bytecode writing is off for the load, so nothing is cached into the
+    user's .claude/hooks/.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(script_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    saved, sys.dont_write_bytecode = sys.dont_write_bytecode, True
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.dont_write_bytecode = saved
+    return module
+
+
 def main():
     try:
         hook_input = json.load(sys.stdin)
     except (json.JSONDecodeError, ValueError):
         return
 
+    common = _load_sibling("hook-common.py", "hook_common")
+
     transcript_path = hook_input.get("transcript_path", "")
     session_id = hook_input.get("session_id", "unknown")
 
     if not transcript_path or not os.path.isfile(transcript_path):
         return
 
-    # Wait for transcript to finish flushing (file size stabilizes)
-    prev_size = -1
-    for _ in range(10):
-        try:
-            curr_size = os.path.getsize(transcript_path)
-        except OSError:
-            curr_size = 0
-        if curr_size == prev_size:
-            break
-        prev_size = curr_size
-        time.sleep(0.2)
+    common.wait_for_flush(transcript_path)
 
     # Extract start timestamp from first record that has one
-    start_ts = None
-    try:
-        with open(transcript_path, "r") as f:
-            for line in f:
-                try:
-                    ts = json.loads(line).get("timestamp")
-                    if ts:
-                        start_ts = ts
-                        break
-                except (json.JSONDecodeError, AttributeError):
-                    continue
-    except OSError:
-        pass
+    start_ts = common.first_timestamp(transcript_path)
 
     # Convert UTC timestamp to local time
-    if start_ts:
-        try:
-            m = re.match(r"(\d{4}-\d{2}-\d{2})T(\d{2}):(\d{2}):(\d{2})", start_ts)
-            if m:
-                utc_dt = datetime.fromisoformat(start_ts.replace("Z", "+00:00"))
-                local_dt = utc_dt.astimezone(ZoneInfo(TZ))
-                date_str = local_dt.strftime("%Y-%m-%d")
-                time_part = local_dt.strftime("%H%M")
-                local_ts = local_dt.isoformat()
-            else:
-                raise ValueError("no match")
-        except Exception:
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            time_part = "0000"
-            local_ts = start_ts or ""
-    else:
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        time_part = "0000"
-        local_ts = ""
+    date_str, time_part, local_ts = common.local_start(start_ts, TZ)
 
     os.makedirs(".claude/logs", exist_ok=True)
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
     short_id = session_id[:8]
     log_file = f".claude/logs/{date_str}-{time_part}-{short_id}.md"
     error_log = ".claude/logs/.converter-errors.log"
 
-    with open(error_log, "a") as err_f:
-        subprocess.run(
-            [
-                sys.executable, os.path.join(script_dir, "log-converter.py"),
-                "--transcript", transcript_path,
-                "--output", log_file,
-                "--session-id", session_id,
-                "--date", date_str,
-                "--start-time", local_ts,
-            ],
-            stdout=subprocess.DEVNULL,
-            stderr=err_f,
-        )
+    # Convert in-process; whatever the converter prints to stderr or raises
+    # goes to the error log, whose presence is the failure signal
+    with open(error_log, "a") as err_f, contextlib.redirect_stderr(err_f):
+        try:
+            _load_sibling("log-converter.py", "log_converter").convert(
+                transcript_path, log_file,
+                session_id=session_id, date=date_str, start_time=local_ts,
+            )
+        except SystemExit:
+            pass
+        except Exception:
+            traceback.print_exc(file=err_f)
 
     # Remove error log if empty — its presence is the signal
     try:
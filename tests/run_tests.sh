@@ -6,6 +6,12 @@
 #   ./tests/run_tests.sh --py-only    # python only
 #   ./tests/run_tests.sh --js-only    # node only
 #   ./tests/run_tests.sh -v           # verbose
+#   ./tests/run_tests.sh --parallel   # run test classes concurrently
+#   ./tests/run_tests.sh --parallel --thread   # threads instead of processes
+#
+# --parallel needs unittest-parallel (pip install unittest-parallel). It runs
+# each test class in its own worker on all cores; --py-only/--js-only still
+# apply. --thread suits free-threaded Python builds, where it skips the fork.
 
 set -e
 
@@ -14,6 +20,26 @@ PKG_DIR="$(dirname "$SCRIPT_DIR")"
 
 cd "$PKG_DIR"
 
+# --- Parallel mode ---
+if [[ " $* " == *" --parallel "* ]]; then
+    if ! python3 -c "import unittest_parallel" 2>/dev/null; then
+        echo "--parallel needs unittest-parallel: pip install unittest-parallel"
+        exit 1
+    fi
+    # Runtime flags become -k filters, so every py- or js-only test class
+    # must be named *_py or *_js to be selected
+    ARGS=()
+    for arg in "$@"; do
+        case "$arg" in
+            --parallel) ;;
+            --py-only) ARGS+=(-k "_py.") ;;
+            --js-only) ARGS+=(-k "_js.") ;;
+            *) ARGS+=("$arg") ;;
+        esac
+    done
+    exec python3 -m unittest_parallel -s tests -t tests --level=class "${ARGS[@]}"
+fi
+
 PASS_ARGS="$*"
 FAILED=0
 
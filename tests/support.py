@@ -0,0 +1,21 @@
+"""Setup shared by the test modules: the temp root and our command-line flags."""
+
+import os
+import sys
+import unittest
+
+# Temp files go on tmpfs when there is one; TESTS_TMPROOT overrides
+TMPROOT = os.environ.get("TESTS_TMPROOT") or (
+    "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+)
+
+PY_ONLY = "--py-only" in sys.argv
+JS_ONLY = "--js-only" in sys.argv
+
+# Flags the test modules read from sys.argv themselves
+OWN_FLAGS = ("--py-only", "--js-only", "--keep-server")
+
+
+def main():
+    """Run the calling test module's tests; our flags are not unittest's."""
+    unittest.main(argv=[a for a in sys.argv if a not in OWN_FLAGS])
@@ -8,68 +8,197 @@ Usage:
     python3 tests/test_converter.py --js-only  # node only
 """
 
+import importlib.util
+import json
 import os
+import re
+import select
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
+from collections import Counter
+
+import support
+from support import JS_ONLY, PY_ONLY, TMPROOT
 
 PKG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PY_CONVERTER = os.path.join(PKG_DIR, "py", "log-converter.py")
 JS_CONVERTER = os.path.join(PKG_DIR, "js", "log-converter.cjs")
 FIXTURES_DIR = os.path.join(PKG_DIR, "tests", "fixtures")
 
-# Determine which runtimes to test based on CLI flags
-_PY_ONLY = "--py-only" in sys.argv
-_JS_ONLY = "--js-only" in sys.argv
-if _PY_ONLY:
-    sys.argv.remove("--py-only")
-if _JS_ONLY:
-    sys.argv.remove("--js-only")
-
+# Header arguments shared by every conversion that doesn't override them
+HEADER_ARGS = {
+    "session_id": "abc12345-test",
+    "date": "2026-02-16",
+    "start_time": "2026-02-16T18:56:00",
+}
 
 def _runtimes():
     """Yield (label, command_prefix) for each runtime under test."""
-    if not _JS_ONLY:
+    if not JS_ONLY:
         yield ("py", [sys.executable, PY_CONVERTER])
-    if not _PY_ONLY:
+    if not PY_ONLY:
         yield ("js", ["node", JS_CONVERTER])
 
 
-def run_converter(cmd, fixture, session_id="abc12345-test", date="2026-02-16",
-                  start_time="2026-02-16T18:56:00", agent_type=None,
+def _load_py_converter():
+    """Import py/log-converter.py (its name isn't importable) as a module."""
+    spec = importlib.util.spec_from_file_location("log_converter", PY_CONVERTER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_py_converter = None
+
+# One long-lived node process serves every JS conversion: it reads one JSON
+# request per line on stdin and answers each with one JSON line
+_JS_WORKER_SRC = r"""
+const readline = require("readline");
+const { convert } = require(process.argv[1]);
+readline.createInterface({ input: process.stdin }).on("line", (line) => {
+  let reply;
+  try {
+    convert(JSON.parse(line));
+    reply = { ok: true };
+  } catch (e) {
+    reply = { ok: false, error: String((e && e.stack) || e) };
+  }
+  process.stdout.write(JSON.stringify(reply) + "\n");
+});
+"""
+
+_js_worker = None
+
+# Seconds one JS worker conversion may take before the worker is killed
+_JS_WORKER_TIMEOUT = 10
+
+# Serializes loading the py converter and each JS worker round-trip, since
+# the parallel runner's --thread mode shares them between test classes
+_converter_lock = threading.Lock()
+
+
+def _convert_py(**kwargs):
+    global _py_converter
+    with _converter_lock:
+        if _py_converter is None:
+            _py_converter = _load_py_converter()
+    _py_converter.convert(**kwargs)
+
+
+def _convert_js(**kwargs):
+    global _js_worker
+    request = {
+        "transcript": kwargs["transcript"],
+        "output": kwargs["output"],
+        "sessionId": kwargs["session_id"],
+        "date": kwargs["date"],
+        "startTime": kwargs["start_time"],
+        "agentType": kwargs["agent_type"],
+        "agentId": kwargs["agent_id"],
+    }
+    with _converter_lock:
+        if _js_worker is None:
+            _js_worker = subprocess.Popen(
+                ["node", "-e", _JS_WORKER_SRC, JS_CONVERTER],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                # Not the inherited cwd, which may be a hook test's temp dir
+                cwd=PKG_DIR,
+            )
+        _js_worker.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+        _js_worker.stdin.flush()
+        line = _read_js_reply()
+    reply = json.loads(line)
+    if not reply["ok"]:
+        raise RuntimeError(f"Converter failed:\n  {reply['error']}")
+
+
+def _read_js_reply():
+    """Read the worker's one-line reply; the caller holds _converter_lock.
+
+    A worker that exits or takes longer than _JS_WORKER_TIMEOUT is stopped
+    and an error raised, so a wedged node process can't hang the suite.
+    """
+    fd = _js_worker.stdout.fileno()
+    reply = b""
+    deadline = time.monotonic() + _JS_WORKER_TIMEOUT
+    while not reply.endswith(b"\n"):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            _close_js_worker(kill=True)
+            raise RuntimeError(
+                f"JS converter worker gave no reply in {_JS_WORKER_TIMEOUT}s")
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            rc = _close_js_worker()
+            raise RuntimeError(f"JS converter worker exited (rc={rc})")
+        reply += chunk
+    return reply
+
+
+def _close_js_worker(kill=False):
+    """Stop the JS worker, closing its pipes; return its exit code."""
+    global _js_worker
+    worker, _js_worker = _js_worker, None
+    if kill:
+        worker.kill()
+    try:
+        worker.communicate(timeout=10)
+    except subprocess.TimeoutExpired:
+        worker.kill()
+        worker.communicate()
+    return worker.returncode
+
+
+def tearDownModule():
+    _converter_cache.clear()
+    with _converter_lock:
+        if _js_worker is not None:
+            _close_js_worker()
+
+
+# Output is a pure function of the runtime, fixture and header arguments, so
+# each distinct call is converted once and replayed for later tests
+_converter_cache = {}
+
+
+def run_converter(label, fixture, session_id=HEADER_ARGS["session_id"],
+                  date=HEADER_ARGS["date"],
+                  start_time=HEADER_ARGS["start_time"], agent_type=None,
                   agent_id=None):
-    """Run a converter command and return the output markdown string."""
+    """Convert a fixture with the given runtime and return the markdown.
+
+    Runs in-process for py and through the shared node worker for js; the
+    command-line path is covered by the tests that run self.cmd directly.
+    """
+    key = (label, fixture, session_id, date, start_time, agent_type, agent_id)
+    if key in _converter_cache:
+        return _converter_cache[key]
+
     fixture_path = os.path.join(FIXTURES_DIR, fixture)
-    with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as f:
+    with tempfile.NamedTemporaryFile(suffix=".md", delete=False, dir=TMPROOT) as f:
         output_path = f.name
 
     try:
-        args = cmd + [
-            "--transcript", fixture_path,
-            "--output", output_path,
-            "--session-id", session_id,
-            "--date", date,
-            "--start-time", start_time,
-        ]
-        if agent_type:
-            args += ["--agent-type", agent_type]
-        if agent_id:
-            args += ["--agent-id", agent_id]
-
-        result = subprocess.run(args, capture_output=True, text=True, timeout=10)
-        if result.returncode != 0:
-            raise RuntimeError(
-                f"Converter failed (exit {result.returncode}):\n"
-                f"  stderr: {result.stderr}\n  stdout: {result.stdout}"
-            )
-
+        convert = _convert_py if label == "py" else _convert_js
+        convert(
+            transcript=fixture_path, output=output_path,
+            session_id=session_id, date=date, start_time=start_time,
+            agent_type=agent_type, agent_id=agent_id,
+        )
         with open(output_path, "r") as f:
-            return f.read()
+            md = f.read()
     finally:
         if os.path.exists(output_path):
             os.unlink(output_path)
 
+    _converter_cache[key] = md
+    return md
+
 
 class ConverterTestBase:
     """Mixin with test methods. Subclasses set self.label and self.cmd."""
@@ -77,13 +206,13 @@ class ConverterTestBase:
     # --- Header tests ---
 
     def test_session_header(self):
-        md = run_converter(self.cmd, "basic.jsonl")
+        md = run_converter(self.label, "basic.jsonl")
         self.assertIn("# Session `abc12345` — 2026-02-16 18:56", md)
         self.assertIn("---", md)
 
     def test_subagent_header(self):
         md = run_converter(
-            self.cmd, "basic.jsonl",
+            self.label, "basic.jsonl",
             agent_type="Explore", agent_id="aaaa1111-bbbb-cccc"
         )
         self.assertIn("# Subagent: Explore `aaaa1111`", md)
@@ -91,25 +220,32 @@ class ConverterTestBase:
 
     # --- Basic rendering ---
 
+    # Everything test_basic_user_assistant expects, found in one scan
+    _BASIC_EXPECTED = (
+        "**User:**",
+        "> Hello, how are you?",
+        "I'm doing well, thanks for asking!",
+        "> What can you help me with?",
+        "software engineering tasks",
+    )
+    _BASIC_PATTERN = re.compile("|".join(map(re.escape, _BASIC_EXPECTED)))
+
     def test_basic_user_assistant(self):
-        md = run_converter(self.cmd, "basic.jsonl")
-        self.assertIn("**User:**", md)
-        self.assertIn("> Hello, how are you?", md)
-        self.assertIn("I'm doing well, thanks for asking!", md)
-        self.assertIn("> What can you help me with?", md)
-        self.assertIn("software engineering tasks", md)
+        md = run_converter(self.label, "basic.jsonl")
+        hits = {m.group(0) for m in self._BASIC_PATTERN.finditer(md)}
+        self.assertEqual(set(self._BASIC_EXPECTED) - hits, set())
 
     # --- Tool call rendering ---
 
     def test_tool_call_inline(self):
         """Short tool results (<=4 lines) render inline with ⎿ prefix."""
-        md = run_converter(self.cmd, "tool-calls.jsonl")
+        md = run_converter(self.label, "tool-calls.jsonl")
         self.assertIn("`Read(/tmp/config.json)`", md)
         self.assertIn('⎿  { "key": "value" }', md)
 
     def test_tool_call_collapsed(self):
         """Long tool results (>4 lines) render in <details> blocks."""
-        md = run_converter(self.cmd, "long-result.jsonl")
+        md = run_converter(self.label, "long-result.jsonl")
         self.assertIn("<details>", md)
         self.assertIn("<summary>", md)
         self.assertIn("Bash(ls -la)", md)
@@ -118,7 +254,7 @@ class ConverterTestBase:
 
     def test_multi_tool_calls(self):
         """Parallel tool calls each get their own result."""
-        md = run_converter(self.cmd, "multi-tool.jsonl")
+        md = run_converter(self.label, "multi-tool.jsonl")
         self.assertIn("`Read(/tmp/a.txt)`", md)
         self.assertIn("content of a", md)
         self.assertIn("`Read(/tmp/b.txt)`", md)
@@ -128,7 +264,7 @@ class ConverterTestBase:
 
     def test_edit_diff(self):
         """Edit tool shows a diff block."""
-        md = run_converter(self.cmd, "edit-diff.jsonl")
+        md = run_converter(self.label, "edit-diff.jsonl")
         self.assertIn("`Update(/tmp/test.py)`", md)
         self.assertIn("```diff", md)
         self.assertIn("-def hello_wrold():", md)
@@ -140,7 +276,7 @@ class ConverterTestBase:
 
     def test_all_tool_headers(self):
         """Each tool type gets the right header format."""
-        md = run_converter(self.cmd, "all-tool-types.jsonl")
+        md = run_converter(self.label, "all-tool-types.jsonl")
         self.assertIn("`Bash(echo hello", md)
         self.assertIn("`Read(/tmp/test.txt)`", md)
         self.assertIn("`Write(/tmp/out.txt)`", md)
@@ -157,7 +293,7 @@ class ConverterTestBase:
 
     def test_error_result(self):
         """Tool errors show Error prefix and strip <tool_use_error> tags."""
-        md = run_converter(self.cmd, "error-result.jsonl")
+        md = run_converter(self.label, "error-result.jsonl")
         self.assertIn("**Error:**", md)
         self.assertIn("No such file or directory", md)
         # The XML tags should be stripped
@@ -168,7 +304,7 @@ class ConverterTestBase:
 
     def test_thinking_blocks_omitted(self):
         """Thinking blocks are not rendered."""
-        md = run_converter(self.cmd, "thinking-blocks.jsonl")
+        md = run_converter(self.label, "thinking-blocks.jsonl")
         self.assertNotIn("Let me calculate", md)
         self.assertIn("2+2 = 4", md)
 
@@ -176,7 +312,7 @@ class ConverterTestBase:
 
     def test_malformed_json_skipped(self):
         """Bad JSON lines are skipped, valid ones render normally."""
-        md = run_converter(self.cmd, "malformed.jsonl")
+        md = run_converter(self.label, "malformed.jsonl")
         self.assertIn("> Valid message", md)
         self.assertIn("Valid response", md)
 
@@ -184,7 +320,7 @@ class ConverterTestBase:
 
     def test_null_timestamp_skipped(self):
         """Records with null timestamps (file-history-snapshot) are skipped."""
-        md = run_converter(self.cmd, "null-timestamp.jsonl")
+        md = run_converter(self.label, "null-timestamp.jsonl")
         self.assertIn("> Hello", md)
         self.assertIn("Hi there!", md)
         # Should not contain any reference to null
@@ -194,7 +330,7 @@ class ConverterTestBase:
 
     def test_skip_types_filtered(self):
         """queue-operation, progress, system types don't appear in output."""
-        md = run_converter(self.cmd, "skip-types.jsonl")
+        md = run_converter(self.label, "skip-types.jsonl")
         self.assertIn("> Only real message", md)
         self.assertIn("Only real response", md)
         # The body should only have the one exchange
@@ -205,7 +341,7 @@ class ConverterTestBase:
 
     def test_context_continuation_collapsed(self):
         """Context continuation messages render in a details block."""
-        md = run_converter(self.cmd, "context-continuation.jsonl")
+        md = run_converter(self.label, "context-continuation.jsonl")
         self.assertIn("**Context restored from previous session", md)
         self.assertIn("<details>", md)
         self.assertIn("<summary>Session summary</summary>", md)
@@ -215,37 +351,63 @@ class ConverterTestBase:
 
     def test_empty_transcript(self):
         """Empty JSONL file creates an empty output file."""
-        with tempfile.NamedTemporaryFile(
-            suffix=".jsonl", delete=False, mode="w"
-        ) as f:
-            f.write("")
-            empty_fixture = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as f:
+        with tempfile.NamedTemporaryFile(suffix=".md", delete=False, dir=TMPROOT) as f:
             output_path = f.name
 
         try:
             result = subprocess.run(
                 self.cmd + [
-                    "--transcript", empty_fixture,
+                    "--transcript", os.path.join(FIXTURES_DIR, "empty.jsonl"),
                     "--output", output_path,
                 ],
-                capture_output=True, text=True, timeout=10,
+                capture_output=True, timeout=10,
             )
             self.assertEqual(result.returncode, 0)
             with open(output_path, "r") as f:
                 content = f.read()
             self.assertEqual(content, "")
         finally:
-            os.unlink(empty_fixture)
             if os.path.exists(output_path):
                 os.unlink(output_path)
 
+    # --- JSONL sidecar ---
+
+    def test_jsonl_sidecar(self):
+        """--jsonl-sidecar writes one JSON record per grouped item."""
+        with tempfile.NamedTemporaryFile(suffix=".md", delete=False, dir=TMPROOT) as f:
+            output_path = f.name
+        with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False, dir=TMPROOT) as f:
+            sidecar_path = f.name
+
+        try:
+            result = subprocess.run(
+                self.cmd + [
+                    "--transcript", os.path.join(FIXTURES_DIR, "tool-calls.jsonl"),
+                    "--output", output_path,
+                    "--jsonl-sidecar", sidecar_path,
+                ],
+                capture_output=True, timeout=10,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            with open(sidecar_path, "r") as f:
+                records = [json.loads(line) for line in f]
+
+            kinds = [r["kind"] for r in records]
+            self.assertEqual(kinds, ["user", "assistant", "tool_result", "assistant"])
+            self.assertEqual(records[0]["text"], "Read my config file")
+            self.assertEqual(records[2]["tool_use_id"], "tu_01")
+            self.assertEqual(records[2]["content"], '{ "key": "value" }')
+            self.assertFalse(records[2]["is_error"])
+        finally:
+            for path in (output_path, sidecar_path):
+                if os.path.exists(path):
+                    os.unlink(path)
+
     # --- Parity check (run both and compare structure) ---
 
     def test_output_not_empty(self):
         """Sanity check: converter produces non-empty output."""
-        md = run_converter(self.cmd, "basic.jsonl")
+        md = run_converter(self.label, "basic.jsonl")
         self.assertGreater(len(md), 50)
 
 
@@ -260,25 +422,102 @@ for label, cmd in _runtimes():
 del label, cmd, cls_name, cls
 
 
+@unittest.skipIf(JS_ONLY, "Python converter only")
+class TestEditDiff_py(unittest.TestCase):
+    """Exact diff bodies from the Python converter's trimmed Edit diff."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.edit_diff_lines = staticmethod(_load_py_converter()._edit_diff_lines)
+
+    def test_prefix_longer_than_context(self):
+        """Hunk headers count from the top of the full text."""
+        old = ("import os\nimport sys\n\n\ndef main():\n"
+               "    args = sys.argv[1:]\n    if not args:\n        return 1\n"
+               "    print(args)\n    return 0\n\n\nmain()")
+        new = old.replace("        return 1",
+                          "        print(\"usage: main ARGS\")\n        return 2")
+        self.assertEqual(self.edit_diff_lines(old, new), [
+            "@@ -6,5 +6,6 @@",
+            "     args = sys.argv[1:]",
+            "     if not args:",
+            "-        return 1",
+            "+        print(\"usage: main ARGS\")",
+            "+        return 2",
+            "     print(args)",
+            "     return 0",
+        ])
+
+    def test_repeated_lines_keep_full_context(self):
+        """A change difflib places inside the kept context still gets both context lines."""
+        old = "e\nd\n-\nd\ne\ne\nb\nc\na\n-\nb\n-"
+        new = "e\nd\n-\nd\ne\nb\nc\na\n-\nb\n-"
+        self.assertEqual(self.edit_diff_lines(old, new), [
+            "@@ -3,5 +3,4 @@", " -", " d", "-e", " e", " b",
+        ])
+
+
+# Fixtures converted by both runtimes for TestConverterParity
+_PARITY_FIXTURES = [
+    "basic.jsonl",
+    "tool-calls.jsonl",
+    "long-result.jsonl",
+    "edit-diff.jsonl",
+    "error-result.jsonl",
+    "multi-tool.jsonl",
+    "all-tool-types.jsonl",
+    "context-continuation.jsonl",
+]
+
+# Block markers whose counts must agree between runtimes
+_BLOCK_MARKERS = re.compile(r"(?P<user>\*\*User:\*\*)|(?P<details><details>)")
+
+
+def _count_blocks(md):
+    """Count User: and <details> blocks in a single pass."""
+    return Counter(m.lastgroup for m in _BLOCK_MARKERS.finditer(md))
+
+
 class TestConverterParity(unittest.TestCase):
     """Verify Python and JS converters produce equivalent output."""
 
-    def setUp(self):
-        runtimes = list(_runtimes())
+    @classmethod
+    def setUpClass(cls):
+        """Convert every parity fixture with one --batch run per runtime."""
+        runtimes = dict(_runtimes())
         if len(runtimes) < 2:
-            self.skipTest("Need both runtimes for parity tests")
-        self.py_cmd = None
-        self.js_cmd = None
-        for label, cmd in runtimes:
-            if label == "py":
-                self.py_cmd = cmd
-            elif label == "js":
-                self.js_cmd = cmd
+            raise unittest.SkipTest("Need both runtimes for parity tests")
+
+        tmpdir = tempfile.mkdtemp(dir=TMPROOT)
+        cls.addClassCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        for label, cmd in runtimes.items():
+            requests = "".join(
+                json.dumps(dict(
+                    HEADER_ARGS,
+                    transcript=os.path.join(FIXTURES_DIR, fixture),
+                    output=os.path.join(tmpdir, f"{label}-{fixture}.md"),
+                )) + "\n"
+                for fixture in _PARITY_FIXTURES
+            )
+            result = subprocess.run(cmd + ["--batch"], input=requests.encode("utf-8"),
+                                    capture_output=True, timeout=30)
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f"{label} batch conversion failed (exit {result.returncode}):\n"
+                    f"  stderr: {result.stderr.decode(errors='replace')}"
+                )
+
+        cls.outputs = {}
+        for fixture in _PARITY_FIXTURES:
+            pair = []
+            for label in ("py", "js"):
+                with open(os.path.join(tmpdir, f"{label}-{fixture}.md"), "r") as f:
+                    pair.append(f.read())
+            cls.outputs[fixture] = tuple(pair)
 
     def _compare_fixture(self, fixture):
-        """Run both converters and compare structural elements."""
-        py_md = run_converter(self.py_cmd, fixture)
-        js_md = run_converter(self.js_cmd, fixture)
+        """Compare structural elements of both converters' output."""
+        py_md, js_md = self.outputs[fixture]
 
         # Headers should match exactly
         py_header = py_md.split("---")[0]
@@ -286,16 +525,10 @@ class TestConverterParity(unittest.TestCase):
         self.assertEqual(py_header.strip(), js_header.strip(),
                          f"Header mismatch for {fixture}")
 
-        # Both should have same number of User: blocks
-        self.assertEqual(
-            py_md.count("**User:**"), js_md.count("**User:**"),
-            f"User block count mismatch for {fixture}"
-        )
-
-        # Both should have same number of <details> blocks
+        # Both should have the same number of User: and <details> blocks
         self.assertEqual(
-            py_md.count("<details>"), js_md.count("<details>"),
-            f"Details block count mismatch for {fixture}"
+            _count_blocks(py_md), _count_blocks(js_md),
+            f"User/details block count mismatch for {fixture}"
         )
 
     def test_parity_basic(self):
@@ -324,4 +557,4 @@ class TestConverterParity(unittest.TestCase):
 
 
 if __name__ == "__main__":
-    unittest.main()
+    support.main()
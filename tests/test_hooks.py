@@ -8,54 +8,89 @@ Usage:
     python3 tests/test_hooks.py --js-only
 """
 
+import contextlib
+import importlib.util
+import io
 import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
 
+import support
+from support import JS_ONLY, PY_ONLY, TMPROOT
+
 PKG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 FIXTURES_DIR = os.path.join(PKG_DIR, "tests", "fixtures")
 
-# We need installed copies with __TZ__ replaced for testing
-_PY_ONLY = "--py-only" in sys.argv
-_JS_ONLY = "--js-only" in sys.argv
-if _PY_ONLY:
-    sys.argv.remove("--py-only")
-if _JS_ONLY:
-    sys.argv.remove("--js-only")
-
 
 def _runtimes():
-    if not _JS_ONLY:
+    if not JS_ONLY:
         yield "py"
-    if not _PY_ONLY:
+    if not PY_ONLY:
         yield "js"
 
 
+def _import_hook(path):
+    """Import a py hook script (its file name isn't importable) as a module."""
+    name = os.path.basename(path)[:-3].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 class HookTestBase:
     """Mixin with hook tests. Subclasses set self.runtime ('py' or 'js')."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Stage the hook scripts with __TZ__ replaced, once per class."""
+        cls.staging_dir = tempfile.mkdtemp(dir=TMPROOT)
+        src_dir = os.path.join(PKG_DIR, cls.runtime)
+        for script in os.listdir(src_dir):
+            # Skip __pycache__ left by tests that import the py hooks
+            if not os.path.isfile(os.path.join(src_dir, script)):
+                continue
+            with open(os.path.join(src_dir, script), "r") as f:
+                content = f.read()
+            content = content.replace("__TZ__", "America/New_York")
+            with open(os.path.join(cls.staging_dir, script), "w") as f:
+                f.write(content)
+
+        cls.modules = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.staging_dir, ignore_errors=True)
+
+    @classmethod
+    def _load_hook(cls, script_name):
+        """Import a staged py hook once per class; its converter sits beside it."""
+        if script_name not in cls.modules:
+            cls.modules[script_name] = _import_hook(
+                os.path.join(cls.staging_dir, script_name))
+        return cls.modules[script_name]
+
     def setUp(self):
         """Create a temp project dir with installed hook scripts."""
-        self.tmpdir = tempfile.mkdtemp()
+        self.tmpdir = tempfile.mkdtemp(dir=TMPROOT)
         self.hooks_dir = os.path.join(self.tmpdir, ".claude", "hooks")
         self.logs_dir = os.path.join(self.tmpdir, ".claude", "logs")
         os.makedirs(self.hooks_dir)
 
-        # Copy hook scripts with __TZ__ replaced
-        ext = self.runtime
-        src_dir = os.path.join(PKG_DIR, self.runtime)
-        for script in os.listdir(src_dir):
-            src = os.path.join(src_dir, script)
+        # Hard-link the staged scripts in; copy if linking isn't possible
+        for script in os.listdir(self.staging_dir):
+            src = os.path.join(self.staging_dir, script)
             dst = os.path.join(self.hooks_dir, script)
-            with open(src, "r") as f:
-                content = f.read()
-            content = content.replace("__TZ__", "America/New_York")
-            with open(dst, "w") as f:
-                f.write(content)
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy(src, dst)
 
     @property
     def _ext(self):
@@ -64,8 +99,22 @@ class HookTestBase:
     def tearDown(self):
         shutil.rmtree(self.tmpdir, ignore_errors=True)
 
-    def _run_hook(self, script_name, stdin_data):
-        """Run a hook script with JSON on stdin, from the temp project dir."""
+    def _run_hook(self, script_name, stdin_data, in_process=True, env=None):
+        """Run a hook script with JSON on stdin, from the temp project dir.
+
+        py hooks run in-process by default, mirroring the script's own
+        __main__ guard; in_process=False runs the script as a subprocess.
+        Variables in env are added to the environment, which always means
+        a subprocess since the hooks read them at import.
+
+        An in-process run swaps the process-wide cwd, stdin and stderr, so
+        off the main thread (the parallel runner's --thread mode, where
+        other test classes run alongside) the hook runs as a subprocess.
+        """
+        if (self.runtime == "py" and in_process and env is None
+                and threading.current_thread() is threading.main_thread()):
+            return self._run_hook_in_process(script_name, stdin_data)
+
         script_path = os.path.join(self.hooks_dir, script_name)
         if self.runtime == "py":
             cmd = [sys.executable, script_path]
@@ -73,11 +122,42 @@ class HookTestBase:
             cmd = ["node", script_path]
 
         result = subprocess.run(
-            cmd, input=json.dumps(stdin_data), capture_output=True,
-            text=True, timeout=30, cwd=self.tmpdir,
+            cmd, input=json.dumps(stdin_data).encode("utf-8"),
+            capture_output=True, timeout=30, cwd=self.tmpdir,
+            env=dict(os.environ, **env) if env else None,
         )
         return result
 
+    def _run_hook_in_process(self, script_name, stdin_data):
+        """Run a py hook's main() the way its __main__ guard does.
+
+        Exceptions are swallowed as the guard swallows them; a SystemExit
+        from main() becomes the return code, as it would for the script.
+        """
+        module = self._load_hook(script_name)
+        stderr = io.StringIO()
+        returncode = 0
+        saved_cwd, saved_stdin = os.getcwd(), sys.stdin
+        os.chdir(self.tmpdir)
+        sys.stdin = io.StringIO(json.dumps(stdin_data))
+        try:
+            with contextlib.redirect_stderr(stderr):
+                try:
+                    module.main()
+                except SystemExit as e:
+                    if isinstance(e.code, int):
+                        returncode = e.code
+                    elif e.code is not None:
+                        print(e.code, file=sys.stderr)
+                        returncode = 1
+                except Exception:
+                    pass
+        finally:
+            sys.stdin = saved_stdin
+            os.chdir(saved_cwd)
+        return subprocess.CompletedProcess(
+            [script_name], returncode, b"", stderr.getvalue().encode("utf-8"))
+
     # --- Main hook tests ---
 
     def test_creates_log_file(self):
@@ -86,10 +166,11 @@ class HookTestBase:
         ext = self._ext
         script = "stop-log" + ext
 
+        # Run as a subprocess so the command-line entry point stays covered
         result = self._run_hook(script, {
             "transcript_path": fixture,
             "session_id": "abc12345-6789-0000-0000-000000000000",
-        })
+        }, in_process=False)
 
         self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
         self.assertTrue(os.path.isdir(self.logs_dir),
@@ -147,6 +228,53 @@ class HookTestBase:
         # Should NOT have 0000 (the fallback for missing timestamps)
         self.assertNotIn("0000", log_name)
 
+    def test_first_record_spanning_reads(self):
+        """Hook finds the timestamp after a first record many reads long."""
+        transcript = os.path.join(self.tmpdir, "large-first.jsonl")
+        with open(os.path.join(FIXTURES_DIR, "null-timestamp.jsonl")) as src, \
+                open(transcript, "w") as f:
+            snapshot = {"type": "file-history-snapshot", "timestamp": None,
+                        "snapshot": "x" * (1 << 20)}
+            f.write(json.dumps(snapshot) + "\n" + src.read())
+
+        self._run_hook("stop-log" + self._ext, {
+            "transcript_path": transcript,
+            "session_id": "abc12345-6789-0000-0000-000000000000",
+        })
+
+        md_logs = [f for f in os.listdir(self.logs_dir) if f.endswith(".md")]
+        self.assertEqual(len(md_logs), 1)
+        # 23:56:30 UTC from the first timestamped record = 18:56 ET
+        self.assertIn("2026-02-16-1856", md_logs[0])
+
+    def test_utc_zone_names_and_header(self):
+        """With TZ=UTC, Z and offset timestamps both give the UTC start time."""
+        cases = [
+            # (first timestamp, session id, expected "date HH:MM" in UTC)
+            ("2026-02-16T23:56:30.000Z", "aaaa1111", "2026-02-16 23:56"),
+            ("2026-02-17T02:30:00+05:00", "bbbb2222", "2026-02-16 21:30"),
+        ]
+        for ts, session_id, expected in cases:
+            with self.subTest(timestamp=ts):
+                transcript = os.path.join(self.tmpdir, session_id + ".jsonl")
+                with open(transcript, "w") as f:
+                    f.write(json.dumps({
+                        "type": "user", "timestamp": ts,
+                        "message": {"role": "user", "content": "Hello"},
+                    }) + "\n")
+
+                result = self._run_hook("stop-log" + self._ext, {
+                    "transcript_path": transcript,
+                    "session_id": session_id + "-0000-0000-0000-000000000000",
+                }, env={"TZ": "UTC"})
+                self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+
+                date, hhmm = expected.split()
+                log_name = f"{date}-{hhmm.replace(':', '')}-{session_id}.md"
+                with open(os.path.join(self.logs_dir, log_name)) as f:
+                    header = f.readline().rstrip("\n")
+                self.assertEqual(header, f"# Session `{session_id}` — {expected}")
+
     def test_invalid_json_stdin(self):
         """Hook exits 0 on invalid JSON stdin."""
         ext = self._ext
@@ -159,8 +287,8 @@ class HookTestBase:
             cmd = ["node", script_path]
 
         result = subprocess.run(
-            cmd, input="not json at all", capture_output=True,
-            text=True, timeout=10, cwd=self.tmpdir,
+            cmd, input=b"not json at all", capture_output=True,
+            timeout=10, cwd=self.tmpdir,
         )
         self.assertEqual(result.returncode, 0)
 
@@ -187,8 +315,8 @@ class HookTestBase:
             cmd = ["node", script_path]
 
         result = subprocess.run(
-            cmd, input="", capture_output=True,
-            text=True, timeout=10, cwd=self.tmpdir,
+            cmd, input=b"", capture_output=True,
+            timeout=10, cwd=self.tmpdir,
         )
         self.assertEqual(result.returncode, 0)
 
@@ -207,6 +335,16 @@ class HookTestBase:
         self.assertFalse(os.path.exists(error_log),
                          "Error log should not exist on success")
 
+    def test_hooks_dir_left_clean(self):
+        """A hook run adds nothing (such as __pycache__) to .claude/hooks/."""
+        before = sorted(os.listdir(self.hooks_dir))
+        result = self._run_hook("stop-log" + self._ext, {
+            "transcript_path": os.path.join(FIXTURES_DIR, "basic.jsonl"),
+            "session_id": "abc12345-6789",
+        }, env={"PYTHONDONTWRITEBYTECODE": ""})
+        self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+        self.assertEqual(sorted(os.listdir(self.hooks_dir)), before)
+
     # --- Subagent hook tests ---
 
     def test_subagent_creates_log(self):
@@ -267,6 +405,64 @@ class HookTestBase:
         self.assertEqual(result.returncode, 0)
 
 
+@unittest.skipIf(JS_ONLY, "Python hooks only")
+class TestFlushWait_py(unittest.TestCase):
+    """The flush wait must outlast an active writer but not a quiet file."""
+
+    # Appends spaced well under FLUSH_QUIET, spanning a few quiet periods
+    RECORDS = 10
+    RECORD_INTERVAL = 0.05
+
+    @classmethod
+    def setUpClass(cls):
+        cls.common = _import_hook(os.path.join(PKG_DIR, "py", "hook-common.py"))
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".jsonl", dir=TMPROOT)
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def _start_writer(self):
+        """Start appending records; returns once the first one is written."""
+        started = threading.Event()
+
+        def write():
+            for _ in range(self.RECORDS):
+                with open(self.path, "a") as f:
+                    f.write('{"type":"user"}\n')
+                started.set()
+                time.sleep(self.RECORD_INTERVAL)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        self.addCleanup(writer.join)
+        started.wait()
+        return writer
+
+    def test_waits_out_active_writer(self):
+        writer = self._start_writer()
+        self.common.wait_for_flush(self.path)
+        self.assertFalse(writer.is_alive(),
+                         "flush wait ended while the writer was active")
+
+    def test_quiet_file_returns_at_once(self):
+        # Last written a second ago: already past the quiet period
+        past = time.time() - 1
+        os.utime(self.path, (past, past))
+        start = time.monotonic()
+        self.common.wait_for_flush(self.path)
+        self.assertLess(time.monotonic() - start, self.common.FLUSH_QUIET / 10)
+
+    def test_fresh_write_waits_rest_of_quiet_period(self):
+        with open(self.path, "a") as f:
+            f.write('{"type":"user"}\n')
+        start = time.monotonic()
+        self.common.wait_for_flush(self.path)
+        elapsed = time.monotonic() - start
+        self.assertGreater(elapsed, self.common.FLUSH_QUIET / 2)
+        self.assertLess(elapsed, self.common.FLUSH_TIMEOUT)
+
+
 # Dynamically create test classes for each runtime
 for runtime in _runtimes():
     cls_name = f"TestHooks_{runtime}"
@@ -278,4 +474,4 @@ del runtime, cls_name, cls
 
 
 if __name__ == "__main__":
-    unittest.main()
+    support.main()
@@ -16,52 +16,83 @@ import sys
 import tempfile
 import unittest
 
+import support
+from support import JS_ONLY, PY_ONLY, TMPROOT
+
 PKG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PY_INSTALLER = os.path.join(PKG_DIR, "install.py")
 JS_INSTALLER = os.path.join(PKG_DIR, "install.js")
 
-_PY_ONLY = "--py-only" in sys.argv
-_JS_ONLY = "--js-only" in sys.argv
-if _PY_ONLY:
-    sys.argv.remove("--py-only")
-if _JS_ONLY:
-    sys.argv.remove("--js-only")
-
 
 def _runtimes():
-    if not _JS_ONLY:
+    if not JS_ONLY:
         yield "py"
-    if not _PY_ONLY:
+    if not PY_ONLY:
         yield "js"
 
 
 class InstallerTestBase:
     """Mixin with installer tests. Subclasses set self.runtime."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Installed trees keyed by prompt answer, shared by read-only tests
+        cls.snapshot_root = tempfile.mkdtemp(dir=TMPROOT)
+        cls.snapshots = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.snapshot_root, ignore_errors=True)
+
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
+        self.tmpdir = tempfile.mkdtemp(dir=TMPROOT)
         # Create a fake git repo so the installer doesn't abort
         os.makedirs(os.path.join(self.tmpdir, ".git"))
 
     def tearDown(self):
         shutil.rmtree(self.tmpdir, ignore_errors=True)
 
-    def _run_installer(self, stdin_text, extra_args=None):
-        """Run the installer in the temp project directory."""
-        if self.runtime == "py":
+    @classmethod
+    def _installer_cmd(cls, extra_args=None):
+        if cls.runtime == "py":
             cmd = [sys.executable, PY_INSTALLER]
         else:
             cmd = ["node", JS_INSTALLER]
+        return cmd + (extra_args or [])
 
-        if extra_args:
-            cmd += extra_args
-
+    def _run_installer(self, stdin_text, extra_args=None):
+        """Run the installer in the temp project directory."""
         result = subprocess.run(
-            cmd, input=stdin_text, capture_output=True,
-            text=True, timeout=15, cwd=self.tmpdir,
+            self._installer_cmd(extra_args), input=stdin_text.encode("utf-8"),
+            capture_output=True, timeout=15, cwd=self.tmpdir,
         )
         return result
 
+    def _installed(self, stdin_text):
+        """Give self.tmpdir a fresh install for stdin_text; return its result.
+
+        The installer runs once per class for each answer and the tree is
+        hard-linked in from the snapshot, so only tests that read the
+        installed files may use this.
+        """
+        cls = type(self)
+        if stdin_text not in cls.snapshots:
+            snapshot = tempfile.mkdtemp(dir=cls.snapshot_root)
+            os.makedirs(os.path.join(snapshot, ".git"))
+            result = subprocess.run(
+                self._installer_cmd(), input=stdin_text.encode("utf-8"),
+                capture_output=True, timeout=15, cwd=snapshot,
+            )
+            cls.snapshots[stdin_text] = (snapshot, result)
+
+        snapshot, result = cls.snapshots[stdin_text]
+        try:
+            shutil.copytree(snapshot, self.tmpdir, copy_function=os.link,
+                            dirs_exist_ok=True)
+        except OSError:
+            shutil.copytree(snapshot, self.tmpdir, dirs_exist_ok=True)
+        return result
+
     @property
     def _ext(self):
         return ".cjs" if self.runtime == "js" else ".py"
@@ -69,7 +100,10 @@ class InstallerTestBase:
     @property
     def _expected_scripts(self):
         ext = self._ext
-        return [f"stop-log{ext}", f"subagent-stop-log{ext}", f"log-converter{ext}"]
+        scripts = [f"stop-log{ext}", f"subagent-stop-log{ext}", f"log-converter{ext}"]
+        if self.runtime == "py":
+            scripts.append("hook-common.py")
+        return scripts
 
     @property
     def _runtime_cmd(self):
@@ -79,7 +113,7 @@ class InstallerTestBase:
 
     def test_fresh_install_creates_files(self):
         """Installer copies all hook scripts to .claude/hooks/."""
-        result = self._run_installer("America/New_York\n")
+        result = self._installed("America/New_York\n")
 
         self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
 
@@ -92,7 +126,7 @@ class InstallerTestBase:
 
     def test_fresh_install_creates_serve_script(self):
         """Installer copies serve-sessions script to .claude/."""
-        result = self._run_installer("America/New_York\n")
+        result = self._installed("America/New_York\n")
 
         self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
 
@@ -102,7 +136,7 @@ class InstallerTestBase:
 
     def test_fresh_install_creates_settings(self):
         """Installer creates .claude/settings.json with hook config."""
-        self._run_installer("UTC\n")
+        self._installed("UTC\n")
 
         settings_path = os.path.join(self.tmpdir, ".claude", "settings.json")
         self.assertTrue(os.path.isfile(settings_path))
@@ -121,7 +155,7 @@ class InstallerTestBase:
 
     def test_tz_patched_in_scripts(self):
         """Installer replaces __TZ__ with the user's chosen timezone."""
-        self._run_installer("America/Chicago\n")
+        self._installed("America/Chicago\n")
 
         hooks_dir = os.path.join(self.tmpdir, ".claude", "hooks")
         script = f"stop-log{self._ext}"
@@ -134,7 +168,7 @@ class InstallerTestBase:
     def test_default_tz(self):
         """Installer uses America/New_York as default when user just hits enter."""
         # Just press enter (empty input = use default)
-        self._run_installer("\n")
+        self._installed("\n")
 
         hooks_dir = os.path.join(self.tmpdir, ".claude", "hooks")
         script = f"stop-log{self._ext}"
@@ -215,7 +249,7 @@ class InstallerTestBase:
         result = self._run_installer("UTC\n")
 
         # Output should mention overwrite
-        self.assertIn("Overwrite", result.stdout + result.stderr)
+        self.assertIn(b"Overwrite", result.stdout + result.stderr)
 
     # --- No .git directory ---
 
@@ -227,7 +261,7 @@ class InstallerTestBase:
 
         self.assertNotEqual(result.returncode, 0)
         combined = result.stdout + result.stderr
-        self.assertIn("git", combined.lower())
+        self.assertIn(b"git", combined.lower())
 
 
 # Dynamically create test classes for each runtime
@@ -241,4 +275,4 @@ del runtime, cls_name, cls
 
 
 if __name__ == "__main__":
-    unittest.main()
+    support.main()
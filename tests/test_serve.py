@@ -1,35 +1,49 @@
 """Tests for serve-sessions.py and serve-sessions.cjs log servers.
 
 Verifies HTTPS default, HTTP fallback, strict filename parsing,
-session labels, index, raw markdown, rendered HTML, and 404 handling.
+session labels, index, raw markdown, rendered HTML, assets, conditional GET,
+and 404 handling.
 
 Usage:
     python3 tests/test_serve.py           # test both
     python3 tests/test_serve.py --py-only
     python3 tests/test_serve.py --js-only
+    python3 tests/test_serve.py --keep-server  # reuse servers started by hand
+
+With --keep-server the tests start no servers of their own. Each class
+expects one already running on its port, serving a fixed directory under
+$TMPDIR/cc-serve-tests/ (under /dev/shm when available), and prints the
+command to start it when nothing answers.
 """
 
+import atexit
+import importlib.util
 import json
 import os
+import shlex
 import shutil
+import socket
 import ssl
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import unittest
-import urllib.request
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlsplit
+
+import support
+from support import JS_ONLY, PY_ONLY, TMPROOT
 
 PKG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PY_SERVE = os.path.join(PKG_DIR, "py", "serve-sessions.py")
 JS_SERVE = os.path.join(PKG_DIR, "js", "serve-sessions.cjs")
 
-_PY_ONLY = "--py-only" in sys.argv
-_JS_ONLY = "--js-only" in sys.argv
-if _PY_ONLY:
-    sys.argv.remove("--py-only")
-if _JS_ONLY:
-    sys.argv.remove("--js-only")
+# Use servers started by hand instead of spawning them; see the docstring
+_KEEP_SERVER = "--keep-server" in sys.argv
+# Fixed class directories under --keep-server, so a kept server's --dir stays valid
+_KEEP_ROOT = os.path.join(TMPROOT or tempfile.gettempdir(), "cc-serve-tests")
 
 # Use different ports per runtime and mode to avoid conflicts
 # HTTPS ports
@@ -38,149 +52,419 @@ _HTTPS_PORT_MAP = {"py": 14001, "js": 14002}
 _HTTP_PORT_MAP = {"py": 14003, "js": 14004}
 # Custom cert ports
 _CERT_PORT_MAP = {"py": 14005, "js": 14006}
+# Empty log directory ports
+_EMPTY_PORT_MAP = {"py": 14007, "js": 14008}
+
+# Log fixtures, pre-encoded: filename -> file contents
+_HTTPS_LOGS = {
+    # Well-formed names
+    "2026-02-16-1856-abc12345.md":
+        "# Session `abc12345` \u2014 2026-02-16 18:56\n\n---\n\n**User:**\n> Hello\n\nHi there!\n".encode("utf-8"),
+    "2026-02-16-1900-abc12345-subagent-Explore-dddd1111.md":
+        "# Subagent: Explore `dddd1111` \u2014 2026-02-16 19:00\n\n---\n\nResearch results.\n".encode("utf-8"),
+    # Malformed filename (no HHMM) — should be ignored
+    "2026-02-16-oldformat.md":
+        b"# Old format log\n\nThis should not appear in the index.\n",
+    # File with a label in the header
+    "2026-02-17-0930-def67890.md":
+        "# Session `def67890` \u2014 2026-02-17 09:30 \u2014 Auth Feature\n\n---\n\nWorking on auth.\n".encode("utf-8"),
+}
+_BASIC_LOGS = {
+    "2026-02-16-1856-abc12345.md":
+        "# Session `abc12345` \u2014 2026-02-16 18:56\n\n---\n\nHello\n".encode("utf-8"),
+}
+
+# Server output kept for startup error messages
+OUTPUT_TAIL = 64 * 1024
 
 
 def _runtimes():
-    if not _JS_ONLY:
+    if not JS_ONLY:
         yield "py"
-    if not _PY_ONLY:
+    if not PY_ONLY:
         yield "js"
 
 
+_ssl_context = None
+
+
 def _make_ssl_context():
-    """Create an SSL context that accepts self-signed certs."""
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-    return ctx
+    """Return the shared SSL context that accepts self-signed certs."""
+    global _ssl_context
+    if _ssl_context is None:
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+        _ssl_context = ctx
+    return _ssl_context
+
+
+def _write_logs(log_dir, logs):
+    """Write each pre-encoded log into log_dir with a single write."""
+    for name, data in logs.items():
+        fd = os.open(os.path.join(log_dir, name),
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+# Open connections keyed by origin ("scheme://host:port"), kept alive
+# across fetches
+_conn_cache = {}
+
+
+def _connection(origin, use_ssl):
+    """Return the cached connection for an origin, parsing it on first use."""
+    conn = _conn_cache.get(origin)
+    if conn is None:
+        parts = urlsplit(origin)
+        if use_ssl:
+            conn = HTTPSConnection(parts.hostname, parts.port, timeout=5,
+                                   context=_make_ssl_context())
+        else:
+            conn = HTTPConnection(parts.hostname, parts.port, timeout=5)
+        _conn_cache[origin] = conn
+    return conn
+
+
+def _close_connections(port):
+    """Close the cached connections to one server.
+
+    Only that server's entries are touched, so classes running concurrently
+    under the parallel runner's --thread mode keep their own connections.
+    """
+    for origin in [o for o, c in _conn_cache.items() if c.port == port]:
+        _conn_cache.pop(origin).close()
+
+
+def _request(url, use_ssl, headers=None):
+    """GET a URL over a cached connection; return (response, body bytes).
+
+    A connection the server has since closed is reopened once and the
+    request retried.
+    """
+    # Split off the origin by hand; the full URL parse happens only when
+    # the origin's connection is first created
+    slash = url.find("/", url.index("//") + 2)
+    origin, path = (url, "/") if slash < 0 else (url[:slash], url[slash:])
+    conn = _connection(origin, use_ssl)
+    for attempt in range(2):
+        try:
+            conn.request("GET", path, headers=headers or {})
+            resp = conn.getresponse()
+            return resp, resp.read()
+        # RemoteDisconnected is a ConnectionError too
+        except ConnectionError:
+            conn.close()
+            if attempt:
+                raise
 
 
-def _fetch(url, use_ssl=False):
+def _fetch(url, use_ssl=False, headers=None):
     """Fetch a URL and return (status_code, body)."""
-    ctx = _make_ssl_context() if use_ssl else None
-    try:
-        resp = urllib.request.urlopen(url, timeout=5, context=ctx)
-        return resp.status, resp.read().decode("utf-8")
-    except urllib.error.HTTPError as e:
-        return e.code, e.read().decode("utf-8")
+    resp, body = _request(url, use_ssl, headers)
+    return resp.status, body.decode("utf-8")
 
 
 def _fetch_headers(url, use_ssl=False):
     """Fetch a URL and return the response headers."""
-    ctx = _make_ssl_context() if use_ssl else None
-    resp = urllib.request.urlopen(url, timeout=5, context=ctx)
+    resp, _ = _request(url, use_ssl)
     return resp.headers
 
 
-def _start_server(runtime, port, log_dir, extra_args=None, cwd=None):
-    """Start a serve-sessions process and wait for it to be ready."""
+def _load_py_serve():
+    """Import py/serve-sessions.py (its name isn't importable) as a module."""
+    spec = importlib.util.spec_from_file_location("serve_sessions", PY_SERVE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Throwaway cert/key for the --cert/--key tests, made once per process
+_shared_cert = None
+_shared_cert_lock = threading.Lock()
+
+
+def _get_shared_cert():
+    """Return (cert_path, key_path), generating the pair on first use."""
+    global _shared_cert
+    with _shared_cert_lock:
+        if _shared_cert is None:
+            if _KEEP_SERVER:
+                cert_dir = os.path.join(_KEEP_ROOT, "certs")
+                os.makedirs(cert_dir, exist_ok=True)
+            else:
+                cert_dir = tempfile.mkdtemp(dir=TMPROOT)
+                atexit.register(shutil.rmtree, cert_dir, ignore_errors=True)
+            cert_path = os.path.join(cert_dir, "test.pem")
+            key_path = os.path.join(cert_dir, "test-key.pem")
+            # The server's own in-process minting when cryptography is
+            # installed; otherwise openssl
+            serve = _load_py_serve()
+            if _KEEP_SERVER and os.path.isfile(key_path):
+                pass  # a kept server is already using this pair
+            elif serve.x509 is not None:
+                serve._generate_cert_in_process(cert_path, key_path)
+            else:
+                subprocess.run(
+                    [
+                        "openssl", "req", "-x509",
+                        "-newkey", "ec",
+                        "-pkeyopt", "ec_paramgen_curve:P-256",
+                        "-keyout", key_path,
+                        "-out", cert_path,
+                        "-days", "1",
+                        "-nodes",
+                        "-subj", "/CN=localhost",
+                    ],
+                    capture_output=True, check=True,
+                )
+            _shared_cert = (cert_path, key_path)
+    return _shared_cert
+
+
+def _drain_output(proc):
+    """Read a server's output until EOF, keeping the last OUTPUT_TAIL bytes."""
+    fd = proc.stdout.fileno()
+    while True:
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            break
+        proc.output_tail += chunk
+        del proc.output_tail[:-OUTPUT_TAIL]
+    proc.stdout.close()
+    proc.output_closed.set()
+
+
+def _class_tmpdir(cls):
+    """Create a test class's temp dir; a fixed one under --keep-server."""
+    if not _KEEP_SERVER:
+        return tempfile.mkdtemp(dir=TMPROOT)
+    path = os.path.join(_KEEP_ROOT, cls.__name__)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _remove_class_tmpdir(cls):
+    if not _KEEP_SERVER:
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+
+class _KeptServer:
+    """Stands in for the Popen of a server the tests didn't start."""
+
+    pid = None
+
+    def terminate(self):
+        pass
+
+    def wait(self, timeout=None):
+        return 0
+
+
+def _attach_server(cmd, cwd, base_url, use_ssl):
+    """Check that a --keep-server server answers; say how to start it if not."""
+    try:
+        _fetch(base_url, use_ssl=use_ssl)
+    except OSError:
+        raise RuntimeError(
+            f"--keep-server: nothing answering at {base_url}; start it with\n"
+            f"  cd {shlex.quote(cwd)} && {shlex.join(cmd)}"
+        ) from None
+    return _KeptServer()
+
+
+def _start_server(runtime, port, log_dir, cwd, extra_args=None):
+    """Start a serve-sessions process and wait for it to be ready.
+
+    The server runs from cwd, so its .claude/ files land there, and never
+    downloads front-end assets.
+    """
     if runtime == "py":
         cmd = [sys.executable, PY_SERVE]
     else:
         cmd = ["node", JS_SERVE]
 
-    cmd += ["--port", str(port), "--dir", log_dir]
+    cmd += ["--port", str(port), "--dir", log_dir, "--no-fetch-assets"]
     if extra_args:
         cmd += extra_args
 
-    proc = subprocess.Popen(
-        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-        cwd=cwd,
-    )
-
     # Determine if HTTPS
     use_ssl = "--http" not in (extra_args or [])
     scheme = "https" if use_ssl else "http"
     base_url = f"{scheme}://127.0.0.1:{port}"
 
-    for _ in range(30):
-        time.sleep(0.2)
+    if _KEEP_SERVER:
+        return _attach_server(cmd, cwd, base_url, use_ssl)
+
+    # One pipe for both streams, drained for the server's whole lifetime so
+    # request logging can never fill it; only the tail is kept for errors
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        cwd=cwd,
+    )
+    proc.output_tail = bytearray()
+    proc.output_closed = threading.Event()
+    proc.drain_thread = threading.Thread(
+        target=_drain_output, args=(proc,), daemon=True)
+    proc.drain_thread.start()
+
+    # Poll the port with backoff; once it accepts, make one request through
+    # TLS/HTTP. The Python server listens before loading its cert, so that
+    # request can still find it gone and is covered by the same checks
+    deadline = time.monotonic() + 6.0
+    delay = 0.005
+    while True:
         try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                pass
             _fetch(base_url, use_ssl=use_ssl)
             break
-        except Exception:
+        except OSError:
+            if proc.output_closed.is_set():
+                # Closed output almost always means the server is exiting
+                try:
+                    proc.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    pass
             if proc.poll() is not None:
-                stdout = proc.stdout.read().decode()
-                stderr = proc.stderr.read().decode()
+                proc.drain_thread.join(timeout=1)
+                output = proc.output_tail.decode(errors="replace")
                 raise RuntimeError(
                     f"Server exited early (rc={proc.returncode})\n"
-                    f"stdout: {stdout}\nstderr: {stderr}"
+                    f"output: {output}"
                 )
-            continue
+            if time.monotonic() >= deadline:
+                proc.kill()
+                proc.wait()
+                raise RuntimeError(f"Server did not listen on port {port}")
+            # Sleeps out the backoff, but wakes as soon as the server's
+            # output closes so a failed start is reported straight away
+            proc.output_closed.wait(delay)
+            delay = min(delay * 2, 0.1)
 
     return proc
 
 
-class ServeHTTPSTestBase:
-    """Tests for HTTPS mode (default)."""
+def _stop_server(cls):
+    """Stop a class's server and remove its temp dir; a bad exit is an error."""
+    _close_connections(cls.port)
+    cls.server.terminate()
+    try:
+        rc = cls.server.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        cls.server.kill()
+        rc = cls.server.wait()
+    _remove_class_tmpdir(cls)
+    if rc != 0:
+        cls.server.drain_thread.join(timeout=1)
+        output = cls.server.output_tail.decode(errors="replace")
+        raise RuntimeError(f"Server exited with rc={rc}\noutput: {output}")
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.log_dir = os.path.join(self.tmpdir, "logs")
-        os.makedirs(self.log_dir)
 
-        # Create test log files with well-formed names
-        with open(os.path.join(self.log_dir, "2026-02-16-1856-abc12345.md"), "w") as f:
-            f.write("# Session `abc12345` \u2014 2026-02-16 18:56\n\n---\n\n**User:**\n> Hello\n\nHi there!\n")
+class ServeHTTPSTestBase:
+    """Tests for HTTPS mode (default).
 
-        with open(os.path.join(self.log_dir, "2026-02-16-1900-abc12345-subagent-Explore-dddd1111.md"), "w") as f:
-            f.write("# Subagent: Explore `dddd1111` \u2014 2026-02-16 19:00\n\n---\n\nResearch results.\n")
+    One server serves the whole class; tests that change the log directory
+    do so through _scratch_log so the shared fixture files stay untouched.
+    """
 
-        # Malformed filename (no HHMM) — should be ignored
-        with open(os.path.join(self.log_dir, "2026-02-16-oldformat.md"), "w") as f:
-            f.write("# Old format log\n\nThis should not appear in the index.\n")
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = _class_tmpdir(cls)
+        cls.log_dir = os.path.join(cls.tmpdir, "logs")
+        os.makedirs(cls.log_dir, exist_ok=True)
+        _write_logs(cls.log_dir, _HTTPS_LOGS)
 
-        # File with a label in the header
-        with open(os.path.join(self.log_dir, "2026-02-17-0930-def67890.md"), "w") as f:
-            f.write("# Session `def67890` \u2014 2026-02-17 09:30 \u2014 Auth Feature\n\n---\n\nWorking on auth.\n")
+        cls.asset_dir = os.path.join(cls.tmpdir, "assets")
+        os.makedirs(cls.asset_dir, exist_ok=True)
 
-        self.port = _HTTPS_PORT_MAP[self.runtime]
-        self.base_url = f"https://127.0.0.1:{self.port}"
+        cls.port = _HTTPS_PORT_MAP[cls.runtime]
+        cls.base_url = f"https://127.0.0.1:{cls.port}"
 
         # Run from tmpdir so auto-cert writes to tmpdir/.claude/certs/
-        self.server = _start_server(
-            self.runtime, self.port, self.log_dir, cwd=self.tmpdir
+        cls.server = _start_server(
+            cls.runtime, cls.port, cls.log_dir, cls.tmpdir,
+            extra_args=["--asset-dir", cls.asset_dir],
         )
 
-    def tearDown(self):
-        self.server.terminate()
-        self.server.wait(timeout=5)
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        # The index is deterministic for these fixtures; fetch it once
+        cls.index_status, cls.index_body = _fetch(cls.base_url + "/", use_ssl=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        _stop_server(cls)
+
+    def _scratch_log(self, name, content):
+        """Write a log file that is removed again when the test ends."""
+        path = os.path.join(self.log_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
 
     # --- HTTPS works ---
 
     def test_https_index(self):
         """Server responds over HTTPS by default."""
-        status, body = _fetch(self.base_url + "/", use_ssl=True)
-        self.assertEqual(status, 200)
-        self.assertIn("cc-session-logs", body)
+        self.assertEqual(self.index_status, 200)
+        self.assertIn("cc-session-logs", self.index_body)
+
+    @unittest.skipIf(_KEEP_SERVER, "server output is not captured")
+    def test_plain_http_to_https_port_is_quiet(self):
+        """A failed TLS handshake drops the connection without a traceback."""
+        with socket.create_connection(("127.0.0.1", self.port), timeout=5) as sock:
+            sock.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            while sock.recv(4096):
+                pass
+
+        # The py server logs each request, so a later request's log line
+        # marks everything the dropped connection could have printed
+        probe = "/probe-quiet-handshake.md"
+        _fetch(self.base_url + probe, use_ssl=True)
+        deadline = time.monotonic() + 2.0
+        while (probe.encode() not in self.server.output_tail
+               and self.runtime == "py" and time.monotonic() < deadline):
+            time.sleep(0.01)
+        self.assertNotIn(b"Traceback", self.server.output_tail)
 
     # --- Index ---
 
     def test_index_lists_sessions(self):
-        status, body = _fetch(self.base_url + "/", use_ssl=True)
-        self.assertIn("abc12345", body)
-        self.assertIn("html", body)
-        self.assertIn("md", body)
+        self.assertIn("abc12345", self.index_body)
+        self.assertIn("html", self.index_body)
+        self.assertIn("md", self.index_body)
 
     def test_index_shows_subagent(self):
-        status, body = _fetch(self.base_url + "/", use_ssl=True)
-        self.assertIn("Explore", body)
-        self.assertIn("dddd1111", body)
+        self.assertIn("Explore", self.index_body)
+        self.assertIn("dddd1111", self.index_body)
 
     # --- Strict filename parsing ---
 
     def test_malformed_filename_excluded(self):
         """Files without HHMM in the name are not shown in the index."""
-        status, body = _fetch(self.base_url + "/", use_ssl=True)
-        self.assertNotIn("oldformat", body)
+        self.assertNotIn("oldformat", self.index_body)
 
     # --- Label ---
 
     def test_label_shown_in_index(self):
         """Session label from header is displayed in the index."""
+        self.assertIn("Auth Feature", self.index_body)
+
+    def test_label_update_shown_in_index(self):
+        """Editing a log's label is picked up by the next index request."""
+        path = self._scratch_log(
+            "2026-02-18-1200-fed09876.md",
+            "# Session `fed09876` \u2014 2026-02-18 12:00\n\n---\n",
+        )
+        _fetch(self.base_url + "/", use_ssl=True)
+        with open(path, "w") as f:
+            f.write("# Session `fed09876` \u2014 2026-02-18 12:00 \u2014 Renamed\n\n---\n")
+
         status, body = _fetch(self.base_url + "/", use_ssl=True)
-        self.assertIn("Auth Feature", body)
+        self.assertIn("Renamed", body)
 
     # --- Raw markdown ---
 
@@ -207,14 +491,78 @@ class ServeHTTPSTestBase:
         status, _ = _fetch(self.base_url + "/nonexistent", use_ssl=True)
         self.assertEqual(status, 404)
 
+    # --- Assets ---
+
+    def test_rendered_html_uses_local_assets(self):
+        status, body = _fetch(self.base_url + "/2026-02-16-1856-abc12345", use_ssl=True)
+        self.assertIn('src="/assets/marked.min.js"', body)
+        self.assertNotIn("cdn.jsdelivr.net", body)
+
+    def test_cached_asset_served(self):
+        """Assets present in the --asset-dir cache are served from disk."""
+        asset_path = os.path.join(self.asset_dir, "marked.min.js")
+        with open(asset_path, "w") as f:
+            f.write("/* marked */\n")
+        self.addCleanup(os.remove, asset_path)
+
+        status, body = _fetch(self.base_url + "/assets/marked.min.js", use_ssl=True)
+        self.assertEqual(status, 200)
+        self.assertIn("/* marked */", body)
+
+    def test_uncached_asset_redirects(self):
+        """With --no-fetch-assets, a missing asset stays a CDN redirect."""
+        resp, _ = _request(
+            self.base_url + "/assets/github-markdown-light.min.css", use_ssl=True)
+        self.assertEqual(resp.status, 302)
+        self.assertIn("cdn.jsdelivr.net", resp.headers.get("Location"))
+
+    def test_unknown_asset_404(self):
+        status, _ = _fetch(self.base_url + "/assets/evil.js", use_ssl=True)
+        self.assertEqual(status, 404)
+
     # --- CORS ---
 
     def test_cors_header(self):
         headers = _fetch_headers(self.base_url + "/", use_ssl=True)
         self.assertEqual(headers.get("Access-Control-Allow-Origin"), "*")
 
+    # --- Conditional GET ---
+
+    def test_etag_not_modified(self):
+        """A matching If-None-Match gets a 304 with no body."""
+        for path in ("/", "/2026-02-16-1856-abc12345.md", "/2026-02-16-1856-abc12345"):
+            etag = _fetch_headers(self.base_url + path, use_ssl=True).get("ETag")
+            self.assertTrue(etag, path)
+            status, body = _fetch(self.base_url + path, use_ssl=True,
+                                  headers={"If-None-Match": etag})
+            self.assertEqual(status, 304, path)
+            self.assertEqual(body, "")
+
+    def test_etag_changes_with_file(self):
+        path = self._scratch_log(
+            "2026-02-18-1300-fed09876.md",
+            "# Session `fed09876` \u2014 2026-02-18 13:00\n\n---\n",
+        )
+        url = self.base_url + "/2026-02-18-1300-fed09876.md"
+        etag = _fetch_headers(url, use_ssl=True).get("ETag")
+        with open(path, "a") as f:
+            f.write("More.\n")
+
+        status, body = _fetch(url, use_ssl=True, headers={"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertIn("More.", body)
+
+    def test_if_modified_since(self):
+        url = self.base_url + "/2026-02-16-1856-abc12345.md"
+        last_modified = _fetch_headers(url, use_ssl=True).get("Last-Modified")
+        self.assertTrue(last_modified)
+        status, _ = _fetch(url, use_ssl=True,
+                           headers={"If-Modified-Since": last_modified})
+        self.assertEqual(status, 304)
+
     # --- PID file ---
 
+    @unittest.skipIf(_KEEP_SERVER, "server was not started by the tests")
     def test_pid_file_created(self):
         """Server writes a PID file with pid and url on startup."""
         pid_path = os.path.join(self.tmpdir, ".claude", "serve-sessions.pid")
@@ -227,14 +575,30 @@ class ServeHTTPSTestBase:
         self.assertIn("https://", info["url"])
         self.assertIn(str(self.port), info["url"])
 
-    # --- Empty directory ---
+
+class ServeEmptyTestBase:
+    """Tests against an empty log directory, which needs its own server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = _class_tmpdir(cls)
+        cls.log_dir = os.path.join(cls.tmpdir, "logs")
+        os.makedirs(cls.log_dir, exist_ok=True)
+
+        cls.port = _EMPTY_PORT_MAP[cls.runtime]
+        cls.base_url = f"http://127.0.0.1:{cls.port}"
+
+        cls.server = _start_server(
+            cls.runtime, cls.port, cls.log_dir, cls.tmpdir, extra_args=["--http"]
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        _stop_server(cls)
 
     def test_empty_index(self):
         """Server handles empty log directory gracefully."""
-        for f in os.listdir(self.log_dir):
-            os.remove(os.path.join(self.log_dir, f))
-
-        status, body = _fetch(self.base_url + "/", use_ssl=True)
+        status, body = _fetch(self.base_url + "/", use_ssl=False)
         self.assertEqual(status, 200)
         self.assertIn("No session logs found", body)
 
@@ -242,25 +606,23 @@ class ServeHTTPSTestBase:
 class ServeHTTPTestBase:
     """Tests for --http mode."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.log_dir = os.path.join(self.tmpdir, "logs")
-        os.makedirs(self.log_dir)
-
-        with open(os.path.join(self.log_dir, "2026-02-16-1856-abc12345.md"), "w") as f:
-            f.write("# Session `abc12345` \u2014 2026-02-16 18:56\n\n---\n\nHello\n")
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = _class_tmpdir(cls)
+        cls.log_dir = os.path.join(cls.tmpdir, "logs")
+        os.makedirs(cls.log_dir, exist_ok=True)
+        _write_logs(cls.log_dir, _BASIC_LOGS)
 
-        self.port = _HTTP_PORT_MAP[self.runtime]
-        self.base_url = f"http://127.0.0.1:{self.port}"
+        cls.port = _HTTP_PORT_MAP[cls.runtime]
+        cls.base_url = f"http://127.0.0.1:{cls.port}"
 
-        self.server = _start_server(
-            self.runtime, self.port, self.log_dir, extra_args=["--http"]
+        cls.server = _start_server(
+            cls.runtime, cls.port, cls.log_dir, cls.tmpdir, extra_args=["--http"]
         )
 
-    def tearDown(self):
-        self.server.terminate()
-        self.server.wait(timeout=5)
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    @classmethod
+    def tearDownClass(cls):
+        _stop_server(cls)
 
     def test_http_index(self):
         """Server works over plain HTTP with --http flag."""
@@ -277,44 +639,26 @@ class ServeHTTPTestBase:
 class ServeCustomCertTestBase:
     """Tests for --cert/--key mode."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.log_dir = os.path.join(self.tmpdir, "logs")
-        os.makedirs(self.log_dir)
-        self.cert_dir = os.path.join(self.tmpdir, "custom-certs")
-        os.makedirs(self.cert_dir)
-
-        with open(os.path.join(self.log_dir, "2026-02-16-1856-abc12345.md"), "w") as f:
-            f.write("# Session `abc12345` \u2014 2026-02-16 18:56\n\n---\n\nHello\n")
-
-        # Generate a custom cert
-        self.cert_path = os.path.join(self.cert_dir, "test.pem")
-        self.key_path = os.path.join(self.cert_dir, "test-key.pem")
-        subprocess.run(
-            [
-                "openssl", "req", "-x509",
-                "-newkey", "rsa:2048",
-                "-keyout", self.key_path,
-                "-out", self.cert_path,
-                "-days", "1",
-                "-nodes",
-                "-subj", "/CN=localhost",
-            ],
-            capture_output=True, check=True,
-        )
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = _class_tmpdir(cls)
+        cls.log_dir = os.path.join(cls.tmpdir, "logs")
+        os.makedirs(cls.log_dir, exist_ok=True)
+        _write_logs(cls.log_dir, _BASIC_LOGS)
+
+        cls.cert_path, cls.key_path = _get_shared_cert()
 
-        self.port = _CERT_PORT_MAP[self.runtime]
-        self.base_url = f"https://127.0.0.1:{self.port}"
+        cls.port = _CERT_PORT_MAP[cls.runtime]
+        cls.base_url = f"https://127.0.0.1:{cls.port}"
 
-        self.server = _start_server(
-            self.runtime, self.port, self.log_dir,
-            extra_args=["--cert", self.cert_path, "--key", self.key_path],
+        cls.server = _start_server(
+            cls.runtime, cls.port, cls.log_dir, cls.tmpdir,
+            extra_args=["--cert", cls.cert_path, "--key", cls.key_path],
         )
 
-    def tearDown(self):
-        self.server.terminate()
-        self.server.wait(timeout=5)
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    @classmethod
+    def tearDownClass(cls):
+        _stop_server(cls)
 
     def test_custom_cert_works(self):
         """Server uses custom cert/key when provided."""
@@ -324,30 +668,22 @@ class ServeCustomCertTestBase:
 
 
 # Dynamically create test classes for each runtime
+_BASES = (
+    (ServeHTTPSTestBase, "TestServeHTTPS"),
+    (ServeHTTPTestBase, "TestServeHTTP"),
+    (ServeCustomCertTestBase, "TestServeCert"),
+    (ServeEmptyTestBase, "TestServeEmpty"),
+)
+_classes = {}
 for runtime in _runtimes():
-    # HTTPS tests
-    cls_name = f"TestServeHTTPS_{runtime}"
-    cls = type(cls_name, (ServeHTTPSTestBase, unittest.TestCase), {
-        "runtime": runtime,
-    })
-    globals()[cls_name] = cls
-
-    # HTTP tests
-    cls_name = f"TestServeHTTP_{runtime}"
-    cls = type(cls_name, (ServeHTTPTestBase, unittest.TestCase), {
-        "runtime": runtime,
-    })
-    globals()[cls_name] = cls
-
-    # Custom cert tests
-    cls_name = f"TestServeCert_{runtime}"
-    cls = type(cls_name, (ServeCustomCertTestBase, unittest.TestCase), {
-        "runtime": runtime,
-    })
-    globals()[cls_name] = cls
-
-del runtime, cls_name, cls
+    for base, prefix in _BASES:
+        cls_name = f"{prefix}_{runtime}"
+        _classes[cls_name] = type(cls_name, (base, unittest.TestCase), {
+            "runtime": runtime,
+        })
+globals().update(_classes)
+del _classes, runtime, base, prefix, cls_name
 
 
 if __name__ == "__main__":
-    unittest.main()
+    support.main()